@@ -1,7 +1,11 @@
 """Command-line interface for Knessight pipeline."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from itertools import product
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 import typer
 from rich.console import Console
 from dotenv import load_dotenv
@@ -9,7 +13,7 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
-from .modules.config import Config
+from .modules.config import Config, get_config
 from .modules.database import Database
 from .modules.disambiguation import Disambiguation
 from .modules.job_tracker import JobTracker
@@ -40,14 +44,199 @@ def load_topics_from_file(file_path: Path) -> list[str]:
     if not file_path.exists():
         raise FileNotFoundError(f"Topics file not found: {file_path}")
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        topics = [
-            line.strip()
-            for line in f
-            if line.strip() and not line.strip().startswith("#")
-        ]
+    text = file_path.read_text(encoding="utf-8")
+    lines = (line.strip() for line in text.splitlines())
+    return [line for line in lines if line and not line.startswith("#")]
 
-    return topics
+
+@contextmanager
+def _open_components(
+    db_path: Optional[str],
+) -> Iterator[tuple[Config, Database, Disambiguation, JobTracker, BatchManager]]:
+    """Construct the components shared by the pipeline commands.
+
+    Components are closed when the block exits, also on errors and Ctrl+C,
+    so pending job status and batch logs are always saved.
+
+    Args:
+        db_path: Path to SQLite database (falls back to config)
+
+    Yields:
+        Tuple of (config, database, disambiguation, job_tracker, batch_manager)
+    """
+    config = get_config()
+
+    with ExitStack() as stack:
+        # Use CLI arg if provided, otherwise use config
+        database = Database(
+            Path(db_path or config.DATABASE_PATH),
+            text_cache_path=Path(config.SPEECH_TEXT_CACHE_PATH),
+        )
+        stack.callback(database.close)
+        disambiguation = Disambiguation(database)
+        batch_manager = BatchManager()
+        stack.callback(batch_manager.close)
+        job_tracker = JobTracker()
+        stack.callback(job_tracker.close)
+
+        yield config, database, disambiguation, job_tracker, batch_manager
+
+
+def _load_pipeline_inputs(
+    disambiguation: Disambiguation,
+) -> tuple[dict[str, int], list[str], tuple[tuple[int, str], ...]]:
+    """Load input files and resolve MK names.
+
+    Args:
+        disambiguation: Disambiguation instance used to resolve MK names
+
+    Returns:
+        Tuple of (resolved MKs, topics, all (person_id, topic) pairs)
+    """
+    input_dir = Path.cwd() / "data" / "input"
+    mks_file = input_dir / "mks.txt"
+    topics_file = input_dir / "topics.txt"
+
+    if not mks_file.exists():
+        console.print(f"[red]MKs file not found: {mks_file}[/red]")
+        raise typer.Exit(1)
+
+    if not topics_file.exists():
+        console.print(f"[red]Topics file not found: {topics_file}[/red]")
+        raise typer.Exit(1)
+
+    # Load and resolve MKs
+    console.print("[cyan]Loading and resolving MK names...[/cyan]")
+    mk_names = disambiguation.load_mk_list_from_file(mks_file)
+    resolved_mks = disambiguation.resolve_mk_names(mk_names)
+
+    # Load topics
+    topics = load_topics_from_file(topics_file)
+    console.print(f"\n[cyan]Loaded {len(topics)} topics[/cyan]")
+
+    # Generate all pairs (built once and shared by both phases)
+    all_pairs = tuple(product(resolved_mks.values(), topics))
+
+    return resolved_mks, topics, all_pairs
+
+
+def _validate_config(config: Config):
+    """Exit if required config files are missing.
+
+    Args:
+        config: Configuration manager
+    """
+    errors = config.validate()
+    if errors:
+        console.print("[red]Configuration errors:[/red]")
+        for error in errors:
+            console.print(f"  - {error}")
+        raise typer.Exit(1)
+
+
+def _run_filter(
+    config: Config,
+    database: Database,
+    job_tracker: JobTracker,
+    batch_manager: BatchManager,
+    all_pairs: tuple[tuple[int, str], ...],
+    force_reprocess: bool,
+):
+    """Run the filter phase on pre-loaded inputs.
+
+    Args:
+        config: Configuration manager
+        database: Database instance
+        job_tracker: Job tracker
+        batch_manager: Batch API manager
+        all_pairs: All (person_id, topic) pairs
+        force_reprocess: Reset pairs before computing pending ones
+    """
+    # Get pending pairs
+    if force_reprocess:
+        job_tracker.reset_pairs(all_pairs, phase="filter")
+
+    pending_pairs = job_tracker.get_pending_pairs("filter", all_pairs)
+
+    console.print(
+        f"\n[cyan]Pending filter pairs: {len(pending_pairs)} / {len(all_pairs)}[/cyan]"
+    )
+
+    if not pending_pairs:
+        console.print("[green]All pairs already filtered![/green]")
+        return
+
+    # Run filter pipeline
+    filter_pipeline = FilterPipeline(
+        config,
+        database,
+        batch_manager,
+        job_tracker,
+        intermediate_dir=Path.cwd() / "data" / "intermediate",
+    )
+    try:
+        filter_pipeline.run(pending_pairs)
+    finally:
+        filter_pipeline.close()
+
+    console.print("\n[bold green]Filter pipeline complete![/bold green]")
+
+
+def _run_score(
+    config: Config,
+    database: Database,
+    job_tracker: JobTracker,
+    batch_manager: BatchManager,
+    resolved_mks: dict[str, int],
+    all_pairs: tuple[tuple[int, str], ...],
+    reasoning_rate: float,
+    force_reprocess: bool,
+):
+    """Run the score phase on pre-loaded inputs.
+
+    Args:
+        config: Configuration manager
+        database: Database instance
+        job_tracker: Job tracker
+        batch_manager: Batch API manager
+        resolved_mks: Mapping of input MK name to person_id
+        all_pairs: All (person_id, topic) pairs
+        reasoning_rate: Probability of requesting reasoning
+        force_reprocess: Reset pairs before computing pending ones
+    """
+    output_manager = OutputManager(
+        database, client_data_dir=Path(config.CLIENT_DATA_PATH)
+    )
+
+    # Get pending pairs for scoring (filter_complete)
+    if force_reprocess:
+        job_tracker.reset_pairs(all_pairs, phase="score")
+
+    pending_pairs = job_tracker.get_pending_pairs("score", all_pairs)
+
+    console.print(
+        f"\n[cyan]Pending score pairs: {len(pending_pairs)} / {len(all_pairs)}[/cyan]"
+    )
+
+    if not pending_pairs:
+        console.print("[green]All pairs already scored![/green]")
+        return
+
+    # Run score pipeline
+    score_pipeline = ScorePipeline(
+        config,
+        database,
+        batch_manager,
+        job_tracker,
+        output_manager,
+        client_data_dir=Path(config.CLIENT_DATA_PATH),
+    )
+    score_pipeline.run(pending_pairs, reasoning_rate)
+
+    # Generate mks.csv
+    output_manager.generate_mks_csv(list(resolved_mks.values()))
+
+    console.print("\n[bold green]Score pipeline complete![/bold green]")
 
 
 @app.command()
@@ -61,80 +250,15 @@ def filter(
     console.print("[bold cyan]Knessight Filter Pipeline[/bold cyan]\n")
 
     try:
-        # Initialize components
-        config = Config()
-        # Use CLI arg if provided, otherwise use config
-        db_path = db_path or config.DATABASE_PATH
-        database = Database(Path(db_path))
-        disambiguation = Disambiguation(database)
-        job_tracker = JobTracker()
-        batch_manager = BatchManager()
+        with _open_components(db_path) as components:
+            config, database, disambiguation, job_tracker, batch_manager = components
 
-        # Set paths from config
-        intermediate_dir = Path.cwd() / "data" / "intermediate"
-
-        # Validate config
-        errors = config.validate()
-        if errors:
-            console.print("[red]Configuration errors:[/red]")
-            for error in errors:
-                console.print(f"  - {error}")
-            raise typer.Exit(1)
-
-        # Load MKs and resolve names
-        input_dir = Path.cwd() / "data" / "input"
-        mks_file = input_dir / "mks.txt"
-        topics_file = input_dir / "topics.txt"
-
-        if not mks_file.exists():
-            console.print(f"[red]MKs file not found: {mks_file}[/red]")
-            raise typer.Exit(1)
-
-        if not topics_file.exists():
-            console.print(f"[red]Topics file not found: {topics_file}[/red]")
-            raise typer.Exit(1)
-
-        # Load and resolve MKs
-        console.print("[cyan]Loading and resolving MK names...[/cyan]")
-        mk_names = disambiguation.load_mk_list_from_file(mks_file)
-        resolved_mks = disambiguation.resolve_mk_names(mk_names)
-
-        # Load topics
-        topics = load_topics_from_file(topics_file)
-        console.print(f"\n[cyan]Loaded {len(topics)} topics[/cyan]")
-
-        # Generate all pairs
-        all_pairs = [
-            (person_id, topic)
-            for person_id in resolved_mks.values()
-            for topic in topics
-        ]
-
-        # Get pending pairs
-        if force_reprocess:
-            job_tracker.reset_pairs(all_pairs, phase="filter")
-
-        pending_pairs = job_tracker.get_pending_pairs("filter", all_pairs)
-
-        console.print(
-            f"\n[cyan]Pending filter pairs: {len(pending_pairs)} / {len(all_pairs)}[/cyan]"
-        )
-
-        if not pending_pairs:
-            console.print("[green]All pairs already filtered![/green]")
-            return
-
-        # Run filter pipeline
-        filter_pipeline = FilterPipeline(
-            config,
-            database,
-            batch_manager,
-            job_tracker,
-            intermediate_dir=intermediate_dir,
-        )
-        filter_pipeline.run(pending_pairs)
+            _validate_config(config)
+            _, _, all_pairs = _load_pipeline_inputs(disambiguation)
 
-        console.print("\n[bold green]Filter pipeline complete![/bold green]")
+            _run_filter(
+                config, database, job_tracker, batch_manager, all_pairs, force_reprocess
+            )
 
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
@@ -155,63 +279,21 @@ def score(
     console.print("[bold cyan]Knessight Score Pipeline[/bold cyan]\n")
 
     try:
-        # Initialize components
-        config = Config()
-        # Use CLI arg if provided, otherwise use config
-        db_path = db_path or config.DATABASE_PATH
-        database = Database(Path(db_path))
-        job_tracker = JobTracker()
-        batch_manager = BatchManager()
-        output_manager = OutputManager(
-            database, client_data_dir=Path(config.CLIENT_DATA_PATH)
-        )
-
-        # Load topics and MKs
-        input_dir = Path.cwd() / "data" / "input"
-        mks_file = input_dir / "mks.txt"
-        topics_file = input_dir / "topics.txt"
-
-        disambiguation = Disambiguation(database)
-        mk_names = disambiguation.load_mk_list_from_file(mks_file)
-        resolved_mks = disambiguation.resolve_mk_names(mk_names)
-        topics = load_topics_from_file(topics_file)
-
-        # Generate all pairs
-        all_pairs = [
-            (person_id, topic)
-            for person_id in resolved_mks.values()
-            for topic in topics
-        ]
-
-        # Get pending pairs for scoring (filter_complete)
-        if force_reprocess:
-            job_tracker.reset_pairs(all_pairs, phase="score")
-
-        pending_pairs = job_tracker.get_pending_pairs("score", all_pairs)
-
-        console.print(
-            f"\n[cyan]Pending score pairs: {len(pending_pairs)} / {len(all_pairs)}[/cyan]"
-        )
-
-        if not pending_pairs:
-            console.print("[green]All pairs already scored![/green]")
-            return
-
-        # Run score pipeline
-        score_pipeline = ScorePipeline(
-            config,
-            database,
-            batch_manager,
-            job_tracker,
-            output_manager,
-            client_data_dir=Path(config.CLIENT_DATA_PATH),
-        )
-        score_pipeline.run(pending_pairs, reasoning_rate)
-
-        # Generate mks.csv
-        output_manager.generate_mks_csv(list(resolved_mks.values()))
-
-        console.print("\n[bold green]Score pipeline complete![/bold green]")
+        with _open_components(db_path) as components:
+            config, database, disambiguation, job_tracker, batch_manager = components
+
+            resolved_mks, _, all_pairs = _load_pipeline_inputs(disambiguation)
+
+            _run_score(
+                config,
+                database,
+                job_tracker,
+                batch_manager,
+                resolved_mks,
+                all_pairs,
+                reasoning_rate,
+                force_reprocess,
+            )
 
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
@@ -231,15 +313,38 @@ def both(
     """Run both Filter and Score pipelines sequentially."""
     console.print("[bold cyan]Knessight Full Pipeline[/bold cyan]\n")
 
-    # Run filter
-    console.print("[bold]Step 1: Filter Pipeline[/bold]")
-    filter(db_path, force_reprocess)
-
-    console.print("\n" + "=" * 60 + "\n")
+    try:
+        # Initialize components once and share them between both phases
+        with _open_components(db_path) as components:
+            config, database, disambiguation, job_tracker, batch_manager = components
+
+            _validate_config(config)
+            resolved_mks, _, all_pairs = _load_pipeline_inputs(disambiguation)
+
+            # Run filter
+            console.print("\n[bold]Step 1: Filter Pipeline[/bold]")
+            _run_filter(
+                config, database, job_tracker, batch_manager, all_pairs, force_reprocess
+            )
+
+            console.print("\n" + "=" * 60 + "\n")
+
+            # Run score
+            console.print("[bold]Step 2: Score Pipeline[/bold]")
+            _run_score(
+                config,
+                database,
+                job_tracker,
+                batch_manager,
+                resolved_mks,
+                all_pairs,
+                reasoning_rate,
+                force_reprocess,
+            )
 
-    # Run score
-    console.print("[bold]Step 2: Score Pipeline[/bold]")
-    score(db_path, reasoning_rate, force_reprocess)
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise typer.Exit(1)
 
     console.print("\n[bold green]✓ Full pipeline complete![/bold green]")
 
@@ -273,16 +378,15 @@ def cleanup_intermediate(
             console.print("[yellow]No intermediate directory found[/yellow]")
             return
 
-        # Find score_complete pairs
-        completed = []
-        for key, data in job_tracker._status.items():
-            if data["status"] == "score_complete":
-                parts = key.split("_", 1)
-                if len(parts) == 2:
-                    person_id, topic = parts[0], parts[1]
-                    csv_path = intermediate_dir / f"{person_id}_{topic}_filtered.csv"
-                    if csv_path.exists():
-                        completed.append(csv_path)
+        # Find score_complete pairs with an intermediate file, using one
+        # directory listing instead of a stat per pair
+        existing = {entry.name for entry in os.scandir(intermediate_dir)}
+        wanted = {
+            f"{person_id}_{topic}_filtered.csv"
+            for person_id, topic in job_tracker.iter_by_status("score_complete")
+        }
+
+        completed = [intermediate_dir / name for name in sorted(existing & wanted)]
 
         if not completed:
             console.print("[green]No intermediate files to clean up[/green]")
@@ -298,9 +402,13 @@ def cleanup_intermediate(
                 console.print("[yellow]Cancelled[/yellow]")
                 return
 
-        # Delete files
-        for csv_path in completed:
-            csv_path.unlink()
+        # Delete files (I/O-bound, so fan out across threads)
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            list(
+                executor.map(
+                    lambda csv_path: csv_path.unlink(missing_ok=True), completed
+                )
+            )
 
         console.print(f"[green]✓ Deleted {len(completed)} intermediate files[/green]")
 
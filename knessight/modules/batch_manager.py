@@ -1,13 +1,18 @@
 """OpenAI Batch API manager with cost tracking."""
 
+import heapq
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
+from importlib.util import find_spec
 import os
 
-from openai import OpenAI
+import httpx
+from openai import DefaultHttpxClient, OpenAI
 from rich.console import Console
 from rich.progress import (
     Progress,
@@ -17,19 +22,50 @@ from rich.progress import (
     TimeElapsedColumn,
 )
 
+from . import jsonio
+
 
 class BatchManager:
     """Manages OpenAI Batch API operations."""
 
-    def __init__(self, cache_dir: Path = None, logs_dir: Path = None):
+    # Batch record fields copied into each costs.json entry
+    COST_METADATA_FIELDS = (
+        "phase",
+        "person_id",
+        "topic",
+        "topics",
+        "pair_count",
+        "retry_attempt",
+        "request_count",
+        "submitted_at",
+    )
+
+    def __init__(
+        self,
+        cache_dir: Path = None,
+        logs_dir: Path = None,
+        keep_batch_files: bool = False,
+    ):
         """Initialize batch manager.
 
         Args:
             cache_dir: Directory for batch_jobs.json
             logs_dir: Directory for costs.json and logs
+            keep_batch_files: Also write uploaded batch JSONL to cache_dir (debugging)
         """
         self.console = Console()
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Size the pool for concurrent polling; multiplex over HTTP/2 when h2 is
+        # installed (the "fast" extra), otherwise stay on HTTP/1.1
+        self.client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=DefaultHttpxClient(
+                http2=find_spec("h2") is not None,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=httpx.Timeout(60.0),
+            ),
+        )
+        # Batch retrieval is network-bound, so poll all batches concurrently
+        self._poll_executor = ThreadPoolExecutor(max_workers=16)
 
         if cache_dir is None:
             cache_dir = Path.cwd() / "data" / "cache"
@@ -38,6 +74,7 @@ class BatchManager:
 
         self.cache_dir = Path(cache_dir)
         self.logs_dir = Path(logs_dir)
+        self.keep_batch_files = keep_batch_files
 
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.logs_dir.mkdir(parents=True, exist_ok=True)
@@ -46,64 +83,189 @@ class BatchManager:
         self.costs_path = self.logs_dir / "costs.json"
         self.failed_speeches_path = self.cache_dir / "failed_speeches.json"
 
+        # Append-only change logs, replayed on top of the JSON snapshots
+        self.batch_jobs_log_path = self.batch_jobs_path.with_suffix(".ndjson")
+        self.costs_log_path = self.costs_path.with_suffix(".ndjson")
+        # Dead-letter log for requests that exhausted their retries
+        self.failed_speeches_log_path = self.failed_speeches_path.with_suffix(
+            ".ndjson"
+        )
+
         self._batch_jobs: Dict[str, Dict] = {}
         self._costs: Dict[str, Dict] = {}
         self._failed_speeches: List[Dict] = []
 
+        # Requests queued for coalesced batches (see enqueue_request)
+        self._queue: List[Dict[str, Any]] = []
+        self._queue_batch_size = 0
+        self._group_ids: Dict[str, str] = {}
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        self._queue_lock = threading.Lock()
+
         self._load_data()
 
+        self._batch_jobs_log = open(self.batch_jobs_log_path, "ab")
+        self._costs_log = open(self.costs_log_path, "ab")
+        self._failed_speeches_log = open(self.failed_speeches_log_path, "ab")
+
     def _load_data(self):
         """Load batch jobs and costs from disk."""
         if self.batch_jobs_path.exists():
-            with open(self.batch_jobs_path, "r", encoding="utf-8") as f:
-                self._batch_jobs = json.load(f)
+            self._batch_jobs = jsonio.loads(self.batch_jobs_path.read_bytes())
+
+        for event in self._read_log(self.batch_jobs_log_path):
+            self._batch_jobs.setdefault(event["id"], {}).update(event["patch"])
 
         if self.costs_path.exists():
-            with open(self.costs_path, "r", encoding="utf-8") as f:
-                self._costs = json.load(f)
+            self._costs = jsonio.loads(self.costs_path.read_bytes())
+
+        for event in self._read_log(self.costs_log_path):
+            self._costs[event["id"]] = event["patch"]
 
+        # failed_speeches.json is only written by older versions
         if self.failed_speeches_path.exists():
-            with open(self.failed_speeches_path, "r", encoding="utf-8") as f:
-                self._failed_speeches = json.load(f)
+            self._failed_speeches = jsonio.loads(
+                self.failed_speeches_path.read_bytes()
+            )
+
+        self._failed_speeches.extend(self._read_log(self.failed_speeches_log_path))
+
+    @staticmethod
+    def _read_log(log_path: Path) -> List[Dict]:
+        """Read events from an append-only NDJSON log.
+
+        Args:
+            log_path: Path to the log file
+
+        Returns:
+            List of events in write order (a truncated last line is ignored)
+        """
+        if not log_path.exists():
+            return []
+
+        events = []
+        for line in log_path.read_bytes().splitlines():
+            try:
+                events.append(jsonio.loads(line))
+            except ValueError:
+                continue
+        return events
+
+    @staticmethod
+    def _append_event(log_file, key: str, patch: Dict[str, Any]):
+        """Append a single change event to an open log file.
+
+        Args:
+            log_file: Log file handle opened in append mode
+            key: Batch ID the change applies to
+            patch: Changed fields
+        """
+        # Raw epoch nanoseconds; only formatted when someone inspects the log
+        event = {"id": key, "patch": patch, "ts": time.time_ns()}
+        log_file.write(jsonio.dumps(event) + b"\n")
+        log_file.flush()
+
+    def _append_batch_event(self, batch_id: str, patch: Dict[str, Any]):
+        """Apply a change to a tracked batch and log it.
+
+        Args:
+            batch_id: Batch job ID
+            patch: Fields to set on the batch record
+        """
+        self._batch_jobs.setdefault(batch_id, {}).update(patch)
+        self._append_event(self._batch_jobs_log, batch_id, patch)
+
+    def close(self):
+        """Compact the change logs into JSON snapshots and close them.
+
+        The logs are only removed once both snapshots have been replaced.
+        """
+        self._save_batch_jobs()
+        self._save_costs()
+
+        for log_file, log_path in (
+            (self._batch_jobs_log, self.batch_jobs_log_path),
+            (self._costs_log, self.costs_log_path),
+        ):
+            log_file.close()
+            log_path.unlink(missing_ok=True)
+
+        self._failed_speeches_log.close()
+
+        self._poll_executor.shutdown(wait=False)
+        self.client.close()
+
+    @staticmethod
+    def _write_snapshot(path: Path, data: Dict[str, Any]):
+        """Write a JSON snapshot atomically, via a temp file.
+
+        Args:
+            path: Snapshot path
+            data: Data to write
+        """
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(jsonio.dumps(data, indent=True))
+        os.replace(tmp_path, path)
 
     def _save_batch_jobs(self):
-        """Save batch jobs to disk."""
-        with open(self.batch_jobs_path, "w", encoding="utf-8") as f:
-            json.dump(self._batch_jobs, f, ensure_ascii=False, indent=2)
+        """Save batch jobs snapshot to disk."""
+        self._write_snapshot(self.batch_jobs_path, self._batch_jobs)
 
     def _save_costs(self):
-        """Save costs to disk."""
-        with open(self.costs_path, "w", encoding="utf-8") as f:
-            json.dump(self._costs, f, ensure_ascii=False, indent=2)
+        """Save costs snapshot to disk."""
+        self._write_snapshot(self.costs_path, self._costs)
 
-    def _save_failed_speeches(self):
-        """Save failed speeches to disk."""
-        with open(self.failed_speeches_path, "w", encoding="utf-8") as f:
-            json.dump(self._failed_speeches, f, ensure_ascii=False, indent=2)
+    def _append_failed_speech(self, entry: Dict[str, Any]):
+        """Record a request that gave up retrying in the dead-letter log.
+
+        Args:
+            entry: Failed request with its metadata and timestamp
+        """
+        self._failed_speeches.append(entry)
+        self._failed_speeches_log.write(jsonio.dumps(entry) + b"\n")
 
     def create_batch(
-        self, requests: List[Dict[str, Any]], metadata: Dict[str, Any]
+        self,
+        requests: List[Dict[str, Any]],
+        metadata: Dict[str, Any],
+        groups: Optional[Dict[str, Dict[str, Any]]] = None,
     ) -> str:
         """Create and submit a batch job.
 
         Args:
             requests: List of API requests (OpenAI Batch API format)
             metadata: Metadata about the batch (phase, person_id, topic, etc.)
+            groups: Metadata per custom_id group prefix, for batches that
+                coalesce requests from several pairs (uploaded alongside the
+                input file, so results stay attributable without batch_jobs.json)
 
         Returns:
             Batch job ID
         """
-        # Create JSONL file for batch
-        batch_file_path = (
-            self.cache_dir / f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
-        )
-        with open(batch_file_path, "w", encoding="utf-8") as f:
-            for req in requests:
-                f.write(json.dumps(req, ensure_ascii=False) + "\n")
+        # Serialize the whole batch once and upload it straight from memory
+        file_name = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        payload = b"".join(jsonio.dumps(req) + b"\n" for req in requests)
+
+        if self.keep_batch_files:
+            (self.cache_dir / file_name).write_bytes(payload)
 
         # Upload file
-        with open(batch_file_path, "rb") as f:
-            file_response = self.client.files.create(file=f, purpose="batch")
+        file_response = self.client.files.create(
+            file=(file_name, payload, "application/jsonl"), purpose="batch"
+        )
+
+        if groups:
+            # Batch metadata is too small for the group map, so it gets its
+            # own file, referenced from the batch metadata
+            groups_response = self.client.files.create(
+                file=(
+                    file_name.replace(".jsonl", "_groups.json"),
+                    jsonio.dumps(groups),
+                    "application/json",
+                ),
+                purpose="user_data",
+            )
+            metadata = {**metadata, "groups_file_id": groups_response.id}
 
         # Create batch
         batch = self.client.batches.create(
@@ -116,14 +278,17 @@ class BatchManager:
         batch_id = batch.id
 
         # Track batch
-        self._batch_jobs[batch_id] = {
-            **metadata,
-            "submitted_at": datetime.now().isoformat(),
-            "status": "submitted",
-            "request_count": len(requests),
-            "file_id": file_response.id,
-        }
-        self._save_batch_jobs()
+        self._append_batch_event(
+            batch_id,
+            {
+                **metadata,
+                "submitted_at": datetime.now().isoformat(),
+                "status": "submitted",
+                "request_count": len(requests),
+                "file_id": file_response.id,
+                **({"groups": groups} if groups else {}),
+            },
+        )
 
         self.console.print(
             f"[cyan]→[/cyan] Created batch job: {batch_id} ({len(requests)} requests)"
@@ -131,18 +296,111 @@ class BatchManager:
 
         return batch_id
 
+    def enqueue_request(
+        self, request: Dict[str, Any], metadata: Dict[str, Any], batch_size: int
+    ) -> List[str]:
+        """Queue a request for a batch shared with other (person_id, topic) pairs.
+
+        Requests are tagged with a group prefix on their custom_id so results
+        can be split back per originating pair (see retrieve_grouped_results).
+        A batch is submitted as soon as batch_size requests are queued.
+
+        Args:
+            request: API request (OpenAI Batch API format)
+            metadata: Metadata of the originating pair (phase, person_id, topic, etc.)
+            batch_size: Maximum number of requests per batch
+
+        Returns:
+            List of batch job IDs submitted by this call (empty or one)
+        """
+        group_key = json.dumps(metadata, sort_keys=True, ensure_ascii=False)
+
+        # Pairs may be queued from several threads; batches are uploaded
+        # outside the lock so other threads can keep queueing meanwhile
+        with self._queue_lock:
+            group_id = self._group_ids.get(group_key)
+            if group_id is None:
+                group_id = self._group_ids[group_key] = str(len(self._group_ids))
+                self._groups[group_id] = metadata
+
+            self._queue.append(
+                {**request, "custom_id": f"{group_id}|{request['custom_id']}"}
+            )
+            self._queue_batch_size = batch_size
+
+            if len(self._queue) < batch_size:
+                return []
+            requests = self._take_queued_batch()
+
+        return [self._create_queued_batch(requests)]
+
+    def flush(self) -> List[str]:
+        """Submit all queued requests as batches of up to the queued batch_size.
+
+        Returns:
+            List of batch job IDs created
+        """
+        batch_ids = []
+
+        while True:
+            with self._queue_lock:
+                if not self._queue:
+                    break
+                requests = self._take_queued_batch()
+
+            batch_ids.append(self._create_queued_batch(requests))
+
+        return batch_ids
+
+    def _take_queued_batch(self) -> List[Dict[str, Any]]:
+        """Remove up to batch_size requests from the queue.
+
+        Must be called with _queue_lock held.
+
+        Returns:
+            Requests for one batch
+        """
+        requests = self._queue[: self._queue_batch_size]
+        del self._queue[: self._queue_batch_size]
+        return requests
+
+    def _create_queued_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """Submit queued requests as one batch, recording their groups.
+
+        Args:
+            requests: Requests with group-prefixed custom_ids
+
+        Returns:
+            Batch job ID
+        """
+        group_ids = dict.fromkeys(req["custom_id"].split("|", 1)[0] for req in requests)
+        groups = {group_id: self._groups[group_id] for group_id in group_ids}
+        phases = {group.get("phase") for group in groups.values()}
+
+        metadata = {"pair_count": str(len(groups))}
+        if len(phases) == 1:
+            metadata["phase"] = str(phases.pop())
+
+        return self.create_batch(requests, metadata, groups=groups)
+
     def poll_batches(self, batch_ids: List[str], interval: int = 30) -> Dict[str, str]:
         """Poll batch jobs until completion with detailed progress.
 
+        Each batch starts at a short polling interval that doubles (up to
+        interval) while it makes no progress, and resets as soon as its
+        completed count changes.
+
         Args:
             batch_ids: List of batch job IDs to poll
-            interval: Polling interval in seconds (default: 30)
+            interval: Longest wait between polls of a stalled batch, in
+                seconds (default: 30)
 
         Returns:
             Dictionary mapping batch_id to final status
         """
-        # Use shorter interval for progress updates
+        # Use shorter interval for progress updates, backing off up to interval
         update_interval = min(5, interval)
+        max_interval = max(update_interval, interval)
 
         with Progress(
             SpinnerColumn(),
@@ -165,18 +423,35 @@ class BatchManager:
             }
 
             completed = {}
-            remaining = list(batch_ids)
-            last_full_poll = 0
 
-            while remaining:
-                current_time = time.time()
+            # Adaptive backoff state per batch
+            last_counts = {batch_id: None for batch_id in batch_ids}
+            current_interval = {batch_id: update_interval for batch_id in batch_ids}
+
+            # Min-heap of (next_poll_at, batch_id) so each batch keeps its own
+            # cadence and we only wake up when the earliest one is due
+            schedule = [(0.0, batch_id) for batch_id in batch_ids]
+            heapq.heapify(schedule)
 
-                # Do full API poll at specified interval
-                should_full_poll = (current_time - last_full_poll) >= interval
+            while schedule:
+                time.sleep(max(0, schedule[0][0] - time.monotonic()))
+                current_time = time.monotonic()
 
-                for batch_id in list(remaining):
+                due = []
+                while schedule and schedule[0][0] <= current_time:
+                    due.append(heapq.heappop(schedule)[1])
+
+                # Dispatch retrieve calls for all due batches, then process in order
+                futures = {
+                    batch_id: self._poll_executor.submit(
+                        self.client.batches.retrieve, batch_id
+                    )
+                    for batch_id in due
+                }
+
+                for batch_id, future in futures.items():
                     try:
-                        batch = self.client.batches.retrieve(batch_id)
+                        batch = future.result()
                         status = batch.status
 
                         # Update request counts
@@ -191,18 +466,41 @@ class BatchManager:
                             description=f"[cyan]Batch {batch_id[:8]}... ({counts.completed}/{counts.total} complete, {counts.failed} failed)",
                         )
 
-                        # Update tracking
+                        # Back off while the batch makes no progress
+                        if counts.completed == last_counts[batch_id]:
+                            current_interval[batch_id] = min(
+                                current_interval[batch_id] * 2, max_interval
+                            )
+                        else:
+                            current_interval[batch_id] = update_interval
+                        last_counts[batch_id] = counts.completed
+
+                        # Update tracking (only log actual status changes)
+                        is_final = status in [
+                            "completed",
+                            "failed",
+                            "expired",
+                            "cancelled",
+                        ]
                         if batch_id in self._batch_jobs:
-                            self._batch_jobs[batch_id]["status"] = status
-
-                        if status in ["completed", "failed", "expired", "cancelled"]:
+                            patch = {}
+                            if self._batch_jobs[batch_id].get("status") != status:
+                                patch["status"] = status
+                            if is_final:
+                                patch["completed_at"] = datetime.now().isoformat()
+                            if status == "completed":
+                                # Saves a retrieve round-trip in retrieve_results
+                                patch["output_file_id"] = batch.output_file_id
+                            if patch:
+                                self._append_batch_event(batch_id, patch)
+
+                        if not is_final:
+                            heapq.heappush(
+                                schedule,
+                                (current_time + current_interval[batch_id], batch_id),
+                            )
+                        else:
                             completed[batch_id] = status
-                            remaining.remove(batch_id)
-
-                            if batch_id in self._batch_jobs:
-                                self._batch_jobs[batch_id][
-                                    "completed_at"
-                                ] = datetime.now().isoformat()
 
                             # Track costs if completed
                             if status == "completed":
@@ -219,14 +517,6 @@ class BatchManager:
                             f"[red]Error polling batch {batch_id}: {e}[/red]"
                         )
                         completed[batch_id] = "error"
-                        remaining.remove(batch_id)
-
-                if should_full_poll:
-                    self._save_batch_jobs()
-                    last_full_poll = current_time
-
-                if remaining:
-                    time.sleep(update_interval)
 
         return completed
 
@@ -238,6 +528,7 @@ class BatchManager:
             batch: Batch object from API
         """
         usage = batch.request_counts
+        batch_info = self._batch_jobs.get(batch_id, {})
 
         self._costs[batch_id] = {
             "timestamp": datetime.now().isoformat(),
@@ -246,38 +537,123 @@ class BatchManager:
                 "completed": usage.completed,
                 "failed": usage.failed,
             },
-            "metadata": self._batch_jobs.get(batch_id, {}),
+            "metadata": {
+                field: batch_info[field]
+                for field in self.COST_METADATA_FIELDS
+                if field in batch_info
+            },
         }
 
-        self._save_costs()
+        self._append_event(self._costs_log, batch_id, self._costs[batch_id])
 
-    def retrieve_results(self, batch_id: str) -> List[Dict[str, Any]]:
-        """Retrieve results from a completed batch.
+    def retrieve_results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """Stream results from a completed batch.
+
+        Args:
+            batch_id: Batch job ID
+
+        Yields:
+            Response objects, parsed line by line as the output file downloads
+        """
+        output_file_id = self._batch_jobs.get(batch_id, {}).get("output_file_id")
+
+        if not output_file_id:
+            batch = self.client.batches.retrieve(batch_id)
+
+            if batch.status != "completed":
+                raise ValueError(
+                    f"Batch {batch_id} not completed yet (status: {batch.status})"
+                )
+
+            if not batch.output_file_id:
+                raise ValueError(f"Batch {batch_id} has no output file")
+
+            output_file_id = batch.output_file_id
+
+        # Stream and parse JSONL
+        with self.client.files.with_streaming_response.content(
+            output_file_id
+        ) as file_response:
+            for line in file_response.iter_lines():
+                if line:
+                    yield jsonio.loads(line)
+
+    def retrieve_grouped_results(
+        self, batch_id: str
+    ) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Retrieve results from a completed batch, split by originating pair.
+
+        Batches created with create_batch directly (no groups) are returned as
+        a single group whose metadata is the batch record itself.
 
         Args:
             batch_id: Batch job ID
 
         Returns:
-            List of response objects
+            List of (group metadata, results) tuples; custom_ids have their
+            group prefix removed
         """
-        batch = self.client.batches.retrieve(batch_id)
+        batch_info = self._batch_jobs.get(batch_id, {})
+        groups = self._get_groups(batch_id)
 
-        if batch.status != "completed":
-            raise ValueError(
-                f"Batch {batch_id} not completed yet (status: {batch.status})"
-            )
+        if not groups:
+            return [(batch_info, list(self.retrieve_results(batch_id)))]
 
-        if not batch.output_file_id:
-            raise ValueError(f"Batch {batch_id} has no output file")
+        grouped: Dict[str, List[Dict[str, Any]]] = {
+            group_id: [] for group_id in groups
+        }
+        for result in self.retrieve_results(batch_id):
+            group_id, _, custom_id = result.get("custom_id", "").partition("|")
+            if group_id not in grouped:
+                continue
+            result["custom_id"] = custom_id
+            grouped[group_id].append(result)
 
-        # Download results
-        file_response = self.client.files.content(batch.output_file_id)
-        content = file_response.read().decode("utf-8")
+        return [(groups[group_id], grouped[group_id]) for group_id in groups]
 
-        # Parse JSONL
-        results = [json.loads(line) for line in content.strip().split("\n") if line]
+    def get_batch_groups(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Get the metadata of every pair with requests in a batch.
 
-        return results
+        Args:
+            batch_id: Batch job ID
+
+        Returns:
+            List of group metadata, in the order retrieve_grouped_results
+            returns them
+        """
+        groups = self._get_groups(batch_id)
+        if not groups:
+            return [self._batch_jobs.get(batch_id, {})]
+        return list(groups.values())
+
+    def _get_groups(self, batch_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Get a coalesced batch's group map, downloading it if not tracked locally.
+
+        Args:
+            batch_id: Batch job ID
+
+        Returns:
+            Dictionary mapping group prefix to pair metadata, or None for
+            batches created with create_batch directly
+        """
+        batch_info = self._batch_jobs.get(batch_id, {})
+        if "groups" in batch_info:
+            return batch_info["groups"]
+
+        groups_file_id = batch_info.get("groups_file_id")
+        if not groups_file_id and not batch_info:
+            # Not tracked locally (e.g. batch_jobs.json was lost)
+            batch = self.client.batches.retrieve(batch_id)
+            groups_file_id = (batch.metadata or {}).get("groups_file_id")
+
+        if not groups_file_id:
+            return None
+
+        groups = jsonio.loads(self.client.files.content(groups_file_id).read())
+        self._append_batch_event(
+            batch_id, {"groups": groups, "groups_file_id": groups_file_id}
+        )
+        return groups
 
     def retry_failed_requests(
         self, failed_requests: List[Dict], metadata: Dict, max_attempts: int = 3
@@ -300,15 +676,12 @@ class BatchManager:
             )
 
             # Log to failed speeches
+            timestamp = datetime.now().isoformat()
             for req in failed_requests:
-                self._failed_speeches.append(
-                    {
-                        "request": req,
-                        "metadata": metadata,
-                        "timestamp": datetime.now().isoformat(),
-                    }
+                self._append_failed_speech(
+                    {"request": req, "metadata": metadata, "timestamp": timestamp}
                 )
-            self._save_failed_speeches()
+            self._failed_speeches_log.flush()
 
             return None
 
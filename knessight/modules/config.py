@@ -1,17 +1,56 @@
 """Configuration management for prompts and settings."""
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 import yaml
 
 
+@lru_cache(maxsize=None)
+def _read_scoring_prompt(config_dir: Path, topic: str) -> str:
+    """Read a topic's scoring prompt, shared across Config instances.
+
+    Args:
+        config_dir: Path to config directory
+        topic: Topic name
+
+    Returns:
+        Scoring prompt for the topic
+    """
+    prompt_path = config_dir / "scoring_prompts" / f"{topic}.txt"
+    if not prompt_path.exists():
+        raise FileNotFoundError(
+            f"Scoring prompt for topic '{topic}' not found at {prompt_path}"
+        )
+
+    return prompt_path.read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=None)
+def _read_topic_descriptions(config_dir: Path) -> Dict[str, str]:
+    """Parse topic_descriptions.yaml, shared across Config instances.
+
+    Args:
+        config_dir: Path to config directory
+
+    Returns:
+        Dictionary mapping topic name to one-sentence description
+    """
+    desc_path = config_dir / "topic_descriptions.yaml"
+    if not desc_path.exists():
+        raise FileNotFoundError(f"Topic descriptions not found at {desc_path}")
+
+    return yaml.safe_load(desc_path.read_bytes())
+
+
 class Config:
     """Manages loading and access to configuration and prompts."""
 
     # Default settings
     DATABASE_PATH = "C:\\Users\\בצלאל\\Desktop\\לימודים\\6. פרוייקטים\\IsraPolitics\\Data\\IsraParlTweet.db"
     CLIENT_DATA_PATH = "data/client_data"
+    SPEECH_TEXT_CACHE_PATH = "data/cache/speech_text.db"
     FILTER_MODEL_NAME = "gpt-4o-mini"
     SCORE_MODEL_NAME = "gpt-4o"
     REASONING_SAMPLE_RATE = 0.1
@@ -31,12 +70,17 @@ class Config:
 
         self.config_dir = Path(config_dir)
         self._filter_prompt: str = None
+        self._filter_prompt_parts: List[str] = None
+        self._topic_desc_texts: Dict[tuple, str] = {}
         self._topic_descriptions: Dict[str, str] = None
         self._scoring_prompts: Dict[str, str] = {}
 
         # Override settings from environment variables
         self.DATABASE_PATH = os.getenv("DATABASE_PATH", self.DATABASE_PATH)
         self.CLIENT_DATA_PATH = os.getenv("CLIENT_DATA_PATH", self.CLIENT_DATA_PATH)
+        self.SPEECH_TEXT_CACHE_PATH = os.getenv(
+            "SPEECH_TEXT_CACHE_PATH", self.SPEECH_TEXT_CACHE_PATH
+        )
         self.FILTER_MODEL_NAME = os.getenv("FILTER_MODEL_NAME", self.FILTER_MODEL_NAME)
         self.SCORE_MODEL_NAME = os.getenv("SCORE_MODEL_NAME", self.SCORE_MODEL_NAME)
         self.REASONING_SAMPLE_RATE = float(
@@ -62,8 +106,11 @@ class Config:
             if not prompt_path.exists():
                 raise FileNotFoundError(f"Filter prompt not found at {prompt_path}")
 
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                self._filter_prompt = f.read()
+            self._filter_prompt = prompt_path.read_text(encoding="utf-8")
+            # Split once so building a prompt doesn't rescan the whole template
+            self._filter_prompt_parts = self._filter_prompt.split(
+                "{topic_descriptions}"
+            )
 
         return self._filter_prompt
 
@@ -74,12 +121,8 @@ class Config:
             Dictionary mapping topic name to one-sentence description
         """
         if self._topic_descriptions is None:
-            desc_path = self.config_dir / "topic_descriptions.yaml"
-            if not desc_path.exists():
-                raise FileNotFoundError(f"Topic descriptions not found at {desc_path}")
-
-            with open(desc_path, "r", encoding="utf-8") as f:
-                self._topic_descriptions = yaml.safe_load(f)
+            # Copy so changes through one instance don't reach the shared cache
+            self._topic_descriptions = dict(_read_topic_descriptions(self.config_dir))
 
         return self._topic_descriptions
 
@@ -93,14 +136,7 @@ class Config:
             Scoring prompt for the topic
         """
         if topic not in self._scoring_prompts:
-            prompt_path = self.config_dir / "scoring_prompts" / f"{topic}.txt"
-            if not prompt_path.exists():
-                raise FileNotFoundError(
-                    f"Scoring prompt for topic '{topic}' not found at {prompt_path}"
-                )
-
-            with open(prompt_path, "r", encoding="utf-8") as f:
-                self._scoring_prompts[topic] = f.read()
+            self._scoring_prompts[topic] = _read_scoring_prompt(self.config_dir, topic)
 
         return self._scoring_prompts[topic]
 
@@ -113,20 +149,24 @@ class Config:
         Returns:
             Complete filter prompt with topic descriptions
         """
-        template = self.load_filter_prompt()
-        descriptions = self.load_topic_descriptions()
-
-        # Build formatted topic descriptions
-        topic_desc_text = "\n".join(
-            [
-                f"- {topic}: {descriptions[topic]}"
-                for topic in topics
-                if topic in descriptions
-            ]
-        )
+        self.load_filter_prompt()
+
+        # Build formatted topic descriptions (cached per topic combination)
+        topics_key = tuple(topics)
+        topic_desc_text = self._topic_desc_texts.get(topics_key)
+        if topic_desc_text is None:
+            descriptions = self.load_topic_descriptions()
+            topic_desc_text = "\n".join(
+                [
+                    f"- {topic}: {descriptions[topic]}"
+                    for topic in topics
+                    if topic in descriptions
+                ]
+            )
+            self._topic_desc_texts[topics_key] = topic_desc_text
 
         # Inject into template
-        return template.replace("{topic_descriptions}", topic_desc_text)
+        return topic_desc_text.join(self._filter_prompt_parts)
 
     def validate(self) -> List[str]:
         """Validate that all required config files exist.
@@ -152,3 +192,13 @@ class Config:
             errors.append(f"Missing scoring prompts directory: {scoring_dir}")
 
         return errors
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Get the process-wide Config, reading environment variables only once.
+
+    Returns:
+        Shared Config instance for the default config directory
+    """
+    return Config()
@@ -1,14 +1,59 @@
 """Database access layer for Knesset speeches."""
 
+import json
 import sqlite3
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from contextlib import contextmanager
 
-
-@dataclass
+# IN (...) list sizes; id lists are padded up to the next size with NULLs so
+# each connection's statement cache only ever sees a handful of query shapes
+IN_LIST_BUCKETS = (64, 128, 256, 512, 999)
+# Above this many ids, bind a single JSON array instead of chunked IN lists
+JSON_IN_THRESHOLD = 10000
+# Code points str.strip() treats as whitespace (trim() alone only strips spaces)
+WHITESPACE_CODES = (
+    *range(9, 14),
+    *range(28, 33),
+    0x85,
+    0xA0,
+    0x1680,
+    *range(0x2000, 0x200B),
+    0x2028,
+    0x2029,
+    0x202F,
+    0x205F,
+    0x3000,
+)
+# Speech has text other than whitespace, matching a str.strip() check
+HAS_TEXT_SQL = (
+    "text IS NOT NULL AND "
+    f"trim(text, char({', '.join(map(str, WHITESPACE_CODES))})) <> ''"
+)
+
+
+def _in_list_chunks(ids: List[int]):
+    """Split ids into padded chunks matching one of IN_LIST_BUCKETS.
+
+    Args:
+        ids: Values to bind into an IN (...) list
+
+    Yields:
+        Tuples of (placeholders, params) for each chunk
+    """
+    max_size = IN_LIST_BUCKETS[-1]
+    for start in range(0, len(ids), max_size):
+        chunk = list(ids[start : start + max_size])
+        size = next(b for b in IN_LIST_BUCKETS if b >= len(chunk))
+        chunk.extend([None] * (size - len(chunk)))
+        yield ",".join("?" * size), chunk
+
+
+@dataclass(slots=True)
 class Speech:
     """Represents a speech from knesset_speeches_view."""
 
@@ -25,22 +70,123 @@ class Speech:
     qa: Optional[int] = None
 
 
+class SpeechTextCache:
+    """Persistent speech_id -> text side-table, reused across runs."""
+
+    def __init__(self, cache_path: Path, source_path: Path):
+        """Open (or create) the cache.
+
+        Args:
+            cache_path: Path to the cache SQLite file
+            source_path: Database the texts come from
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS speech_text (id INTEGER PRIMARY KEY, text TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+
+        # Cached texts belong to one version of the source database
+        stat = source_path.stat()
+        source = f"{source_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'source'"
+        ).fetchone()
+        if row is None or row[0] != source:
+            with self._conn:
+                self._conn.execute("DELETE FROM speech_text")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)",
+                    (source,),
+                )
+
+    def get_many(self, speech_ids: List[int]) -> Dict[int, str]:
+        """Look up cached texts.
+
+        Args:
+            speech_ids: Speech IDs to look up
+
+        Returns:
+            Dictionary mapping speech_id to text, for the IDs that are cached
+        """
+        texts = {}
+        with self._lock:
+            for placeholders, params in _in_list_chunks(speech_ids):
+                texts.update(
+                    self._conn.execute(
+                        f"SELECT id, text FROM speech_text WHERE id IN ({placeholders})",
+                        params,
+                    ).fetchall()
+                )
+        return texts
+
+    def put_many(self, texts: Dict[int, str]):
+        """Store texts in a single transaction.
+
+        Args:
+            texts: Dictionary mapping speech_id to text
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO speech_text (id, text) VALUES (?, ?)",
+                texts.items(),
+            )
+
+    def close(self):
+        """Close the cache connection."""
+        with self._lock:
+            self._conn.close()
+
+
 class Database:
     """Read-only SQLite database access for Knesset data."""
 
-    def __init__(self, db_path: Path):
+    # Memory-map up to this much of the database file (large per-person scans
+    # then read pages straight from the mapping instead of via read() calls)
+    MMAP_SIZE = 1 << 30
+
+    def __init__(self, db_path: Path, text_cache_path: Path = None):
         """Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file
+            text_cache_path: Path to the speech text cache (no cache if None)
         """
         self.db_path = Path(db_path)
         if not self.db_path.exists():
             raise FileNotFoundError(f"Database not found at {db_path}")
 
+        # One long-lived read-only connection per thread
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._people_names: Optional[List[tuple]] = None
+        self._people_name_text = ""
+
+        # Rows don't change during a run, so memoize the single-row lookups
+        self._speech_metadata_cache = lru_cache(maxsize=8192)(
+            self._query_speech_metadata
+        )
+        self._person_metadata_cache = lru_cache(maxsize=8192)(
+            self._query_person_metadata
+        )
+
         # Test connection
         self._test_connection()
 
+        self._text_cache = (
+            SpeechTextCache(text_cache_path, self.db_path)
+            if text_cache_path is not None
+            else None
+        )
+
     def _test_connection(self):
         """Test database connection and verify schema."""
         with self._get_connection() as conn:
@@ -55,34 +201,76 @@ class Database:
             if not cursor.fetchone():
                 raise ValueError("Database missing knesset_speeches_view")
 
-    @contextmanager
-    def _get_connection(self):
-        """Get read-only database connection.
+    def _connect(self) -> sqlite3.Connection:
+        """Open a read-only connection tuned for repeated lookups.
 
-        Yields:
+        Returns:
             SQLite connection
         """
         # Open in read-only mode
-        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+        )
         conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        conn.execute("PRAGMA query_only=1")
+        conn.execute(f"PRAGMA mmap_size={self.MMAP_SIZE}")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    @contextmanager
+    def _get_connection(self):
+        """Get this thread's read-only database connection.
+
+        The connection is opened on first use and kept until close().
 
-    def get_all_speeches_by_person_id(self, person_id: int) -> List[Speech]:
+        Yields:
+            SQLite connection
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        yield conn
+
+    def close(self):
+        """Close all pooled connections and the text cache."""
+        if self._text_cache is not None:
+            self._text_cache.close()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        # Threads still holding a closed connection will reconnect on next use
+        self._local = threading.local()
+
+    def get_all_speeches_by_person_id(
+        self, person_id: int, require_text: bool = True, exclude_chair: bool = False
+    ) -> List[Speech]:
         """Retrieve all speeches by a specific person.
 
         Args:
             person_id: The person_id from people table
+            require_text: Skip speeches with empty or whitespace-only text
+            exclude_chair: Skip speeches made while chairing the session
 
         Returns:
             List of Speech objects
         """
+        conditions = ["k.person_id = ?"]
+        if require_text:
+            conditions.append(HAS_TEXT_SQL)
+        if exclude_chair:
+            conditions.append("chair = 0")
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.arraysize = 1000
             cursor.execute(
-                """
+                f"""
                 SELECT 
                     k.id,
                     k.name,
@@ -96,60 +284,203 @@ class Database:
                     k.chair,
                     k.qa
                 FROM knesset_speeches_view k
-                WHERE k.person_id = ?
+                WHERE {' AND '.join(conditions)}
                 ORDER BY k.date, k.id
             """,
                 (person_id,),
             )
 
+            # Columns are selected in Speech field order, so unpack positionally
             speeches = []
-            for row in cursor.fetchall():
-                speeches.append(
-                    Speech(
-                        id=row["id"],
-                        name=row["name"],
-                        text=row["text"] or "",
-                        knesset=row["knesset"],
-                        session_number=row["session_number"],
-                        date=row["date"],
-                        person_id=row["person_id"],
-                        topic=row["topic"],
-                        topic_extra=row["topic_extra"],
-                        chair=row["chair"],
-                        qa=row["qa"],
-                    )
-                )
+            for row in cursor:
+                if row[2] is None:
+                    row = (*row[:2], "", *row[3:])
+                speeches.append(Speech(*row))
 
             return speeches
 
-    def get_speeches_by_ids(self, speech_ids: List[int]) -> Dict[int, str]:
-        """Retrieve speech texts by specific IDs.
+    def get_speech_sample_and_count_by_person_id(
+        self, person_id: int
+    ) -> Tuple[Optional[Speech], int]:
+        """Get a person's first speech and speech count without loading them all.
 
         Args:
-            speech_ids: List of speech IDs to retrieve
+            person_id: The person_id from people table
 
         Returns:
-            Dictionary mapping speech_id to speech text
+            Tuple of (first speech or None, number of speeches), matching
+            get_all_speeches_by_person_id(person_id)[0] and its length
         """
-        if not speech_ids:
-            return {}
-
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                f"""
+                SELECT
+                    id,
+                    name,
+                    coalesce(text, ''),
+                    knesset,
+                    session_number,
+                    date,
+                    person_id,
+                    topic,
+                    topic_extra,
+                    chair,
+                    qa,
+                    COUNT(*) OVER ()
+                FROM knesset_speeches_view
+                WHERE person_id = ? AND {HAS_TEXT_SQL}
+                ORDER BY date, id
+                LIMIT 1
+            """,
+                (person_id,),
+            )
+
+            row = cursor.fetchone()
+            if row is None:
+                return None, 0
+            return Speech(*row[:-1]), row[-1]
 
-            # Build placeholders for IN clause
-            placeholders = ",".join("?" * len(speech_ids))
+    def iter_speech_id_text(
+        self, person_id: int, exclude_chair: bool = False
+    ) -> Iterator[Tuple[int, str]]:
+        """Stream (id, text) for a person's non-empty speeches.
 
+        Args:
+            person_id: The person_id from people table
+            exclude_chair: Skip speeches made while chairing the session
+
+        Yields:
+            Tuples of (speech_id, text), ordered like get_all_speeches_by_person_id
+        """
+        chair_condition = "AND chair = 0" if exclude_chair else ""
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.arraysize = 500
             cursor.execute(
                 f"""
                 SELECT id, text
                 FROM knesset_speeches_view
-                WHERE id IN ({placeholders})
+                WHERE person_id = ? AND {HAS_TEXT_SQL} {chair_condition}
+                ORDER BY date, id
             """,
-                speech_ids,
+                (person_id,),
             )
+            yield from cursor
+
+    def count_speeches_by_person_ids(self, person_ids: List[int]) -> Dict[int, int]:
+        """Count non-empty speeches for several people at once.
+
+        Args:
+            person_ids: person_ids from people table
+
+        Returns:
+            Dictionary mapping each person_id to its speech count (counted like
+            get_all_speeches_by_person_id with require_text=True)
+        """
+        counts = dict.fromkeys(person_ids, 0)
 
-            return {row["id"]: row["text"] or "" for row in cursor.fetchall()}
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            for placeholders, params in _in_list_chunks(list(counts)):
+                cursor.execute(
+                    f"""
+                    SELECT person_id, COUNT(*)
+                    FROM knesset_speeches_view
+                    WHERE person_id IN ({placeholders}) AND {HAS_TEXT_SQL}
+                    GROUP BY person_id
+                """,
+                    params,
+                )
+                counts.update(cursor.fetchall())
+
+        return counts
+
+    def get_speeches_by_ids(self, speech_ids: List[int]) -> Dict[int, str]:
+        """Retrieve speech texts by specific IDs.
+
+        With a text cache, texts already in it are served from it; the rest
+        are read from the database and added to the cache.
+
+        Args:
+            speech_ids: List of speech IDs to retrieve
+
+        Returns:
+            Dictionary mapping speech_id to speech text
+        """
+        if not speech_ids:
+            return {}
+
+        if self._text_cache is None:
+            return self._query_speeches_by_ids(speech_ids)
+
+        texts = self._text_cache.get_many(list(speech_ids))
+        missing = [speech_id for speech_id in speech_ids if speech_id not in texts]
+        if missing:
+            fetched = self._query_speeches_by_ids(missing)
+            self._text_cache.put_many(fetched)
+            texts.update(fetched)
+
+        return texts
+
+    def _query_speeches_by_ids(self, speech_ids: List[int]) -> Dict[int, str]:
+        """Read speech texts by specific IDs from the database (uncached).
+
+        Args:
+            speech_ids: List of speech IDs to retrieve
+
+        Returns:
+            Dictionary mapping speech_id to speech text
+        """
+        return {
+            row["id"]: row["text"] or ""
+            for row in self._select_speeches_by_ids("id, text", speech_ids)
+        }
+
+    def _select_speeches_by_ids(
+        self, columns: str, speech_ids: List[int]
+    ) -> List[sqlite3.Row]:
+        """Select columns of knesset_speeches_view rows by specific IDs.
+
+        Args:
+            columns: Comma-separated column list to select
+            speech_ids: List of speech IDs to retrieve
+
+        Returns:
+            Matching rows (IDs that are not found are skipped)
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            if len(speech_ids) > JSON_IN_THRESHOLD:
+                # One bound parameter, so the parser never sees a huge IN list
+                cursor.execute(
+                    f"""
+                    SELECT {columns}
+                    FROM knesset_speeches_view
+                    WHERE id IN (SELECT value FROM json_each(?))
+                """,
+                    (json.dumps(speech_ids),),
+                )
+                return cursor.fetchall()
+
+            rows = []
+            for placeholders, params in _in_list_chunks(speech_ids):
+                cursor.execute(
+                    f"""
+                    SELECT {columns}
+                    FROM knesset_speeches_view
+                    WHERE id IN ({placeholders})
+                """,
+                    params,
+                )
+                rows.extend(cursor.fetchall())
+
+            return rows
 
     def get_speech_metadata(self, speech_id: int) -> Optional[Dict]:
         """Get metadata for a specific speech.
@@ -160,6 +491,18 @@ class Database:
         Returns:
             Dictionary with speech metadata (id, date, topic, person_id)
         """
+        metadata = self._speech_metadata_cache(speech_id)
+        return dict(metadata) if metadata else None
+
+    def _query_speech_metadata(self, speech_id: int) -> Optional[Dict]:
+        """Query metadata for a specific speech (uncached).
+
+        Args:
+            speech_id: The speech ID
+
+        Returns:
+            Dictionary with speech metadata, or None if not found
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -181,6 +524,31 @@ class Database:
                 }
             return None
 
+    def get_speech_metadata_many(self, speech_ids: List[int]) -> Dict[int, Dict]:
+        """Get metadata for many speeches with a few IN (...) queries.
+
+        Args:
+            speech_ids: List of speech IDs
+
+        Returns:
+            Dictionary mapping speech_id to speech metadata (id, date, topic,
+            person_id); IDs that are not found are omitted
+        """
+        if not speech_ids:
+            return {}
+
+        return {
+            row["id"]: {
+                "id": row["id"],
+                "date": row["date"],
+                "topic": row["topic"],
+                "person_id": row["person_id"],
+            }
+            for row in self._select_speeches_by_ids(
+                "id, date, topic, person_id", list(speech_ids)
+            )
+        }
+
     def get_person_metadata(self, person_id: int) -> Optional[Dict]:
         """Get metadata for a specific person (MK).
 
@@ -190,6 +558,18 @@ class Database:
         Returns:
             Dictionary with person details
         """
+        metadata = self._person_metadata_cache(person_id)
+        return dict(metadata) if metadata else None
+
+    def _query_person_metadata(self, person_id: int) -> Optional[Dict]:
+        """Query metadata for a specific person (uncached).
+
+        Args:
+            person_id: The person_id from people table
+
+        Returns:
+            Dictionary with person details, or None if not found
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -226,8 +606,58 @@ class Database:
                 }
             return None
 
+    def _load_people_names(self) -> List[tuple]:
+        """Load the people table's searchable names once.
+
+        Returns:
+            List of (first_name, surname, person) tuples, with names casefolded
+        """
+        if self._people_names is None:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                cursor.execute(
+                    """
+                    SELECT DISTINCT
+                        person_id,
+                        first_name,
+                        surname,
+                        faction,
+                        party_name
+                    FROM people
+                    ORDER BY person_id
+                """
+                )
+
+                self._people_names = [
+                    (
+                        (first_name or "").casefold(),
+                        (surname or "").casefold(),
+                        {
+                            "person_id": person_id,
+                            "first_name": first_name,
+                            "surname": surname,
+                            "name": f"{first_name} {surname}",
+                            "faction": faction,
+                            "party_name": party_name,
+                        },
+                    )
+                    for person_id, first_name, surname, faction, party_name in cursor
+                ]
+
+            # Every name part in one string, for rejecting names up front
+            self._people_name_text = "\n".join(
+                f"{first_name}\n{surname}"
+                for first_name, surname, _ in self._people_names
+            )
+
+        return self._people_names
+
     def search_people_by_name(self, name: str) -> List[Dict]:
-        """Search for people by name (fuzzy matching at SQL level).
+        """Search for people by name (any name part matching first name or surname).
+
+        The people table is small, so it is read once and matched in memory
+        rather than running a full-table OR-of-LIKE scan per name.
 
         Args:
             name: Name to search for
@@ -235,47 +665,41 @@ class Database:
         Returns:
             List of matching people with their details
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Split name into parts for flexible matching
-            name_parts = name.strip().split()
+        return self.search_people_by_names([name])[name]
 
-            # Build LIKE conditions for flexible matching
-            conditions = []
-            params = []
-            for part in name_parts:
-                conditions.append("(first_name LIKE ? OR surname LIKE ?)")
-                params.extend([f"%{part}%", f"%{part}%"])
-
-            query = f"""
-                SELECT DISTINCT
-                    person_id,
-                    first_name,
-                    surname,
-                    faction,
-                    party_name
-                FROM people
-                WHERE {' OR '.join(conditions)}
-                ORDER BY person_id
-            """
+    def search_people_by_names(self, names: List[str]) -> Dict[str, List[Dict]]:
+        """Search for several names in a single pass over the people table.
 
-            cursor.execute(query, params)
-
-            results = []
-            for row in cursor.fetchall():
-                results.append(
-                    {
-                        "person_id": row["person_id"],
-                        "first_name": row["first_name"],
-                        "surname": row["surname"],
-                        "name": f"{row['first_name']} {row['surname']}",
-                        "faction": row["faction"],
-                        "party_name": row["party_name"],
-                    }
-                )
+        Args:
+            names: Names to search for
 
-            return results
+        Returns:
+            Dictionary mapping each name to its matches (as in search_people_by_name)
+        """
+        people = self._load_people_names()
+        matches: Dict[str, List[Dict]] = {name: [] for name in names}
+
+        # Split names into parts for flexible matching, dropping parts that
+        # appear in no name at all (and names left without any parts)
+        name_parts = {}
+        for name in names:
+            parts = [
+                part
+                for part in name.strip().casefold().split()
+                if part in self._people_name_text
+            ]
+            if parts:
+                name_parts[name] = parts
+
+        if not name_parts:
+            return matches
+
+        for first_name, surname, person in people:
+            for name, parts in name_parts.items():
+                if any(part in first_name or part in surname for part in parts):
+                    matches[name].append(dict(person))
+
+        return matches
 
     def get_all_person_ids(self) -> List[int]:
         """Get all unique person_ids from people table.
@@ -285,5 +709,6 @@ class Database:
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             cursor.execute("SELECT DISTINCT person_id FROM people ORDER BY person_id")
-            return [row["person_id"] for row in cursor.fetchall()]
+            return [person_id for (person_id,) in cursor]
@@ -1,15 +1,34 @@
 """MK name disambiguation with persistent caching."""
 
-import json
+import os
+import re
 from pathlib import Path
-from typing import Dict, List, Optional
-from fuzzywuzzy import fuzz
+from typing import Dict, List, Optional, Tuple
+from rapidfuzz import fuzz, process
 from rich.console import Console
 from rich.table import Table
 from rich.prompt import Prompt
 
+from . import jsonio
 from .database import Database
 
+# fuzzywuzzy's force_ascii drops U+0080-U+00FF (Hebrew is kept) before its
+# token scorers process a name; done here too so scores stay the same
+_LATIN1_TABLE = dict.fromkeys(range(128, 256))
+_NON_WORD_RE = re.compile(r"\W", re.UNICODE)
+
+
+def _token_process(name: str) -> str:
+    """Process a name for token scoring like fuzzywuzzy's full_process.
+
+    Args:
+        name: Lowercased name
+
+    Returns:
+        Processed name
+    """
+    return _NON_WORD_RE.sub(" ", name.translate(_LATIN1_TABLE)).lower().strip()
+
 
 class Disambiguation:
     """Handles MK name resolution with fuzzy matching and caching."""
@@ -31,18 +50,22 @@ class Disambiguation:
         self.cache_path.parent.mkdir(parents=True, exist_ok=True)
 
         self._cache: Dict[str, int] = {}
+        self._dirty = False
+        # Candidate name -> (lowercased, fully processed), shared across input names
+        self._candidate_forms: Dict[str, Tuple[str, str]] = {}
         self._load_cache()
 
     def _load_cache(self):
         """Load resolution cache from disk."""
         if self.cache_path.exists():
-            with open(self.cache_path, "r", encoding="utf-8") as f:
-                self._cache = json.load(f)
+            self._cache = jsonio.loads(self.cache_path.read_bytes())
 
     def _save_cache(self):
-        """Save resolution cache to disk."""
-        with open(self.cache_path, "w", encoding="utf-8") as f:
-            json.dump(self._cache, f, ensure_ascii=False, indent=2)
+        """Save resolution cache to disk (atomically, via a temp file)."""
+        tmp_path = self.cache_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(jsonio.dumps(self._cache, indent=True))
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
 
     def resolve_mk_names(self, names: List[str]) -> Dict[str, int]:
         """Resolve list of MK names to person_ids.
@@ -54,41 +77,48 @@ class Disambiguation:
             Dictionary mapping input name to person_id
         """
         resolved = {}
+        names = [name.strip() for name in names if name.strip()]
+
+        # Fetch candidates for every uncached name in one pass; a fully cached
+        # list never touches the database
+        uncached = [name for name in names if name not in self._cache]
+        candidates_by_name = (
+            self.database.search_people_by_names(uncached) if uncached else {}
+        )
 
-        for name in names:
-            name = name.strip()
-            if not name:
-                continue
-
-            # Check cache first
-            if name in self._cache:
-                resolved[name] = self._cache[name]
-                self.console.print(
-                    f"[green]✓[/green] {name} → person_id {self._cache[name]} (cached)"
-                )
-                continue
-
-            # Attempt resolution
-            person_id = self._resolve_single_name(name)
-            if person_id:
-                resolved[name] = person_id
-                self._cache[name] = person_id
+        try:
+            for name in names:
+                # Check cache first
+                if name in self._cache:
+                    resolved[name] = self._cache[name]
+                    self.console.print(
+                        f"[green]✓[/green] {name} → person_id {self._cache[name]} (cached)"
+                    )
+                    continue
+
+                # Attempt resolution
+                person_id = self._resolve_single_name(name, candidates_by_name[name])
+                if person_id:
+                    resolved[name] = person_id
+                    self._cache[name] = person_id
+                    self._dirty = True
+        finally:
+            # Persist once, even if the interactive loop is interrupted
+            if self._dirty:
                 self._save_cache()
 
         return resolved
 
-    def _resolve_single_name(self, name: str) -> Optional[int]:
+    def _resolve_single_name(self, name: str, candidates: List[Dict]) -> Optional[int]:
         """Resolve a single MK name.
 
         Args:
             name: MK name to resolve
+            candidates: People matching the name (from search_people_by_names)
 
         Returns:
             person_id if resolved, None otherwise
         """
-        # Search database
-        candidates = self.database.search_people_by_name(name)
-
         if not candidates:
             self.console.print(f"[red]✗[/red] No matches found for '{name}'")
             return None
@@ -102,17 +132,28 @@ class Disambiguation:
             return person_id
 
         # Use fuzzy matching to find best matches
-        scored_candidates = []
-        for candidate in candidates:
-            full_name = candidate["name"]
-            # Calculate similarity scores
-            ratio = fuzz.ratio(name.lower(), full_name.lower())
-            partial = fuzz.partial_ratio(name.lower(), full_name.lower())
-            token_sort = fuzz.token_sort_ratio(name.lower(), full_name.lower())
-
-            # Use best score
-            score = max(ratio, partial, token_sort)
-            scored_candidates.append((score, candidate))
+        query = name.lower()
+        forms = [self._get_candidate_forms(c["name"]) for c in candidates]
+        full_names = [lowered for lowered, _ in forms]
+        processed_names = [processed for _, processed in forms]
+
+        # Score all candidates with each scorer in one call, keeping the best score
+        # (token_sort_ratio compares processed strings, see _token_process)
+        best_scores = [0.0] * len(candidates)
+        for scorer, scorer_query, choices in (
+            (fuzz.ratio, query, full_names),
+            (fuzz.partial_ratio, query, full_names),
+            (fuzz.token_sort_ratio, _token_process(query), processed_names),
+        ):
+            for _, score, idx in process.extract(
+                scorer_query, choices, scorer=scorer, processor=None, limit=None
+            ):
+                best_scores[idx] = max(best_scores[idx], score)
+
+        scored_candidates = [
+            (round(score), candidate)
+            for score, candidate in zip(best_scores, candidates)
+        ]
 
         # Sort by score
         scored_candidates.sort(reverse=True, key=lambda x: x[0])
@@ -129,6 +170,25 @@ class Disambiguation:
         # Multiple ambiguous matches - ask user
         return self._interactive_disambiguation(name, scored_candidates)
 
+    def _get_candidate_forms(self, full_name: str) -> Tuple[str, str]:
+        """Get a candidate name's lowercased and fully processed forms.
+
+        The same people come up as candidates for many input names, so the
+        forms are computed once per name and reused.
+
+        Args:
+            full_name: Candidate's full name
+
+        Returns:
+            Tuple of (lowercased name, processed name for token scoring)
+        """
+        forms = self._candidate_forms.get(full_name)
+        if forms is None:
+            lowered = full_name.lower()
+            forms = (lowered, _token_process(lowered))
+            self._candidate_forms[full_name] = forms
+        return forms
+
     def _interactive_disambiguation(
         self, input_name: str, scored_candidates: List[tuple]
     ) -> Optional[int]:
@@ -198,11 +258,6 @@ class Disambiguation:
         if not file_path.exists():
             raise FileNotFoundError(f"MK list file not found: {file_path}")
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            names = [
-                line.strip()
-                for line in f
-                if line.strip() and not line.strip().startswith("#")
-            ]
-
-        return names
+        text = file_path.read_text(encoding="utf-8")
+        lines = (line.strip() for line in text.splitlines())
+        return [line for line in lines if line and not line.startswith("#")]
@@ -1,15 +1,15 @@
 """Phase 1: Filter pipeline - multi-topic relevance scoring."""
 
 import csv
-import json
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Any, List, Dict, Set, TextIO, Tuple
 from collections import defaultdict
 
 from rich.console import Console
 
+from . import jsonio
 from .config import Config
-from .database import Database, Speech
+from .database import Database
 from .batch_manager import BatchManager
 from .job_tracker import JobTracker
 
@@ -17,6 +17,9 @@ from .job_tracker import JobTracker
 class FilterPipeline:
     """Handles Phase 1: filtering speeches for relevance to topics."""
 
+    # Speech texts are fetched from the database this many results at a time
+    TEXT_LOOKUP_CHUNK_SIZE = 500
+
     def __init__(
         self,
         config: Config,
@@ -46,6 +49,20 @@ class FilterPipeline:
         self.intermediate_dir = Path(intermediate_dir)
         self.intermediate_dir.mkdir(parents=True, exist_ok=True)
 
+        # Intermediate CSVs kept open across batches (see _get_csv_writer)
+        self._csv_files: Dict[Path, Tuple[TextIO, Any]] = {}
+
+        # A person's requests can span several coalesced batches; their pairs
+        # are only marked filter_complete once all of those are processed
+        self._pending_batch_ids: Dict[int, Set[str]] = defaultdict(set)
+        self._processed_batch_ids: Dict[int, List[str]] = defaultdict(list)
+
+    def close(self):
+        """Close all open intermediate CSV files."""
+        for f, _ in self._csv_files.values():
+            f.close()
+        self._csv_files.clear()
+
     def run(self, pairs: List[Tuple[int, str]]):
         """Execute filter pipeline for pending pairs.
 
@@ -72,6 +89,14 @@ class FilterPipeline:
             batch_ids = self._process_person(person_id, list(topics))
             all_batch_ids.extend(batch_ids)
 
+        # Submit the last, partially filled batch
+        all_batch_ids.extend(self.batch_manager.flush())
+
+        for batch_id in all_batch_ids:
+            for group in self.batch_manager.get_batch_groups(batch_id):
+                if group.get("person_id"):
+                    self._pending_batch_ids[int(group["person_id"])].add(batch_id)
+
         # Submit and poll batches in tranches to avoid hitting token limits
         # Process in groups, waiting for results before submitting more
         if all_batch_ids:
@@ -119,6 +144,10 @@ class FilterPipeline:
                     )
                     # Try to get error details
                     self._print_batch_error_details(batch_id)
+
+            # Don't hold file handles for persons from earlier tranches
+            self.close()
+            self.job_tracker.flush()
         
         if failed_batch_ids:
             self.console.print(
@@ -133,60 +162,53 @@ class FilterPipeline:
             topics: List of topics to check
 
         Returns:
-            List of batch job IDs created
+            List of batch job IDs submitted so far (requests are coalesced
+            with other persons' into shared batches)
         """
-        # Load all speeches for this person
-        speeches = self.database.get_all_speeches_by_person_id(person_id)
-
-        if not speeches:
-            self.console.print(
-                f"[yellow]No speeches found for person_id {person_id}[/yellow]"
-            )
-            return []
-
-        self.console.print(
-            f"[cyan]Processing {len(speeches)} speeches for person_id {person_id} against {len(topics)} topics[/cyan]"
-        )
-
         # Build filter prompt with all topics
         filter_prompt = self.config.get_filter_prompt(topics)
 
-        # Create batch requests (one speech checked against all topics)
-        requests = []
-        for speech in speeches:
-            if not speech.text or not speech.text.strip():
-                continue
+        # Queue batch requests (one speech checked against all topics). Group
+        # metadata is only tracked locally, so topics stay a list
+        metadata = {
+            "phase": "filter",
+            "person_id": str(person_id),
+            "topics": list(topics),
+        }
+        batch_ids = []
+        speech_count = 0
 
-            request = self._build_filter_request(speech, topics, filter_prompt)
-            requests.append(request)
+        # Stream (id, text) rows; empty speeches are already filtered out in SQL
+        for speech_id, text in self.database.iter_speech_id_text(person_id):
+            request = self._build_filter_request(
+                speech_id, text, topics, filter_prompt
+            )
+            batch_ids.extend(
+                self.batch_manager.enqueue_request(
+                    request, metadata, self.config.BATCH_SIZE
+                )
+            )
+            speech_count += 1
 
-        # Split into batches
-        batch_ids = []
-        batch_size = self.config.BATCH_SIZE
-
-        for i in range(0, len(requests), batch_size):
-            batch_requests = requests[i : i + batch_size]
-
-            batch_id = self.batch_manager.create_batch(
-                batch_requests,
-                metadata={
-                    "phase": "filter",
-                    "person_id": str(person_id),
-                    "topics": ",".join(topics),
-                    "batch_index": str(i // batch_size),
-                },
+        if not speech_count:
+            self.console.print(
+                f"[yellow]No speeches found for person_id {person_id}[/yellow]"
+            )
+        else:
+            self.console.print(
+                f"[cyan]Queued {speech_count} speeches for person_id {person_id} against {len(topics)} topics[/cyan]"
             )
-            batch_ids.append(batch_id)
 
         return batch_ids
 
     def _build_filter_request(
-        self, speech: Speech, topics: List[str], filter_prompt: str
+        self, speech_id: int, text: str, topics: List[str], filter_prompt: str
     ) -> Dict:
         """Build a single filter request for Batch API.
 
         Args:
-            speech: Speech object
+            speech_id: Speech ID
+            text: Speech text
             topics: List of topics to evaluate
             filter_prompt: Filter prompt with topic descriptions
 
@@ -195,7 +217,7 @@ class FilterPipeline:
         """
         # Format message
         user_message = f"""Speech Text:
-{speech.text}
+{text}
 
 Topics to evaluate:
 {', '.join(topics)}
@@ -210,7 +232,7 @@ Respond with JSON only, format:
 }}"""
 
         return {
-            "custom_id": f"speech_{speech.id}",
+            "custom_id": f"speech_{speech_id}",
             "method": "POST",
             "url": "/v1/chat/completions",
             "body": {
@@ -236,100 +258,137 @@ Respond with JSON only, format:
         self.console.print(f"[cyan]→ Processing results for batch {batch_id}...[/cyan]")
 
         try:
-            results = self.batch_manager.retrieve_results(batch_id)
-            self.console.print(f"[cyan]→ Retrieved {len(results)} results[/cyan]")
+            grouped_results = self.batch_manager.retrieve_grouped_results(batch_id)
+            self.console.print(
+                f"[cyan]→ Retrieved {sum(len(r) for _, r in grouped_results)} results "
+                f"for {len(grouped_results)} person(s)[/cyan]"
+            )
 
-            # Get metadata
-            batch_info = self.batch_manager._batch_jobs.get(batch_id, {})
-            person_id = batch_info.get("person_id")
-            topics = batch_info.get("topics", "")
+            for batch_info, results in grouped_results:
+                self._process_person_results(batch_id, batch_info, results)
 
-            # Convert metadata from strings back to correct types
-            if person_id:
-                person_id = int(person_id)
-            if topics:
-                topics = topics.split(",") if isinstance(topics, str) else topics
+        except Exception as e:
+            self.console.print(f"[red]Error processing batch {batch_id}: {e}[/red]")
+            import traceback
 
-            if not person_id or not topics:
-                self.console.print(f"[red]Missing metadata for batch {batch_id}[/red]")
-                return
+            traceback.print_exc()
+            raise
 
-            # First pass: collect all speech IDs we need
-            speech_ids = []
-            for result in results:
-                if result.get("response", {}).get("status_code") != 200:
-                    continue
+    def _process_person_results(
+        self, batch_id: str, batch_info: Dict, results: List[Dict]
+    ):
+        """Process one person's results from a completed batch.
 
-                custom_id = result.get("custom_id", "")
-                if not custom_id.startswith("speech_"):
-                    continue
+        Args:
+            batch_id: Completed batch job ID
+            batch_info: Metadata of the originating person (person_id, topics)
+            results: That person's results from the batch
+        """
+        # Get metadata
+        person_id = batch_info.get("person_id")
+        topics = batch_info.get("topics") or []
+
+        # Convert metadata from strings back to correct types
+        if person_id:
+            person_id = int(person_id)
+        if isinstance(topics, str):
+            # Comma-joined topics from batches tracked by older versions
+            topics = topics.split(",")
+
+        if not person_id or not topics:
+            self.console.print(f"[red]Missing metadata for batch {batch_id}[/red]")
+            return
 
-                speech_id = int(custom_id.split("_")[1])
-                speech_ids.append(speech_id)
+        # Single pass: parse each result and look up texts in fixed-size chunks
+        # Requested topics are known up front; other keys the model returns
+        # are still kept (see _add_filtered_rows)
+        all_by_topic: Dict[str, List[Tuple[int, str, int]]] = {
+            topic: [] for topic in topics
+        }
+        parsed: List[Tuple[int, Dict]] = []
 
-            # Query ONLY the speeches we need by ID
-            speech_map = self.database.get_speeches_by_ids(speech_ids)
+        for result in results:
+            if result.get("response", {}).get("status_code") != 200:
+                continue
 
-            # Group all speeches by topic, saving all results regardless of threshold
-            all_by_topic = defaultdict(list)
+            # Extract speech_id from custom_id
+            custom_id = result.get("custom_id", "")
+            if not custom_id.startswith("speech_"):
+                continue
 
-            for result in results:
-                if result.get("response", {}).get("status_code") != 200:
-                    continue
+            speech_id = int(custom_id[7:])
 
-                # Extract speech_id from custom_id
-                custom_id = result.get("custom_id", "")
-                if not custom_id.startswith("speech_"):
-                    continue
+            # Parse response
+            try:
+                response_body = result["response"]["body"]
+                content = response_body["choices"][0]["message"]["content"]
+                parsed.append((speech_id, jsonio.loads(content)))
 
-                speech_id = int(custom_id.split("_")[1])
+            # ValueError also covers json/orjson decode errors
+            except (KeyError, ValueError) as e:
+                self.console.print(
+                    f"[red]Error parsing result for speech {speech_id}: {e}[/red]"
+                )
+                continue
 
-                # Parse response
-                try:
-                    response_body = result["response"]["body"]
-                    content = response_body["choices"][0]["message"]["content"]
-                    relevance_scores = json.loads(content)
-
-                    # Get speech text from pre-fetched map
-                    speech_text = speech_map.get(speech_id, "")
-                    if not speech_text:
-                        continue
-
-                    for topic, score_data in relevance_scores.items():
-                        relevance = score_data.get("relevance", 0)
-                        all_by_topic[topic].append(
-                            {
-                                "Id": speech_id,
-                                "Text": speech_text,
-                                "RelevanceScore": relevance,
-                            }
-                        )
+            if len(parsed) >= self.TEXT_LOOKUP_CHUNK_SIZE:
+                self._add_filtered_rows(parsed, all_by_topic)
+                parsed = []
 
-                except (json.JSONDecodeError, KeyError, ValueError) as e:
-                    self.console.print(
-                        f"[red]Error parsing result for speech {speech_id}: {e}[/red]"
-                    )
-                    continue
+        if parsed:
+            self._add_filtered_rows(parsed, all_by_topic)
 
-            # Save all speeches to intermediate CSVs (no threshold filtering)
-            for topic, speeches in all_by_topic.items():
-                self._save_filtered_speeches(person_id, topic, speeches)
+        # Save all speeches to intermediate CSVs (no threshold filtering)
+        all_by_topic = {
+            topic: speeches for topic, speeches in all_by_topic.items() if speeches
+        }
+        for topic, speeches in all_by_topic.items():
+            self._save_filtered_speeches(person_id, topic, speeches)
+
+        # Mark all topics as filter_complete once the person's last batch is in
+        processed = self._processed_batch_ids[person_id]
+        processed.append(batch_id)
+        pending = self._pending_batch_ids[person_id]
+        pending.discard(batch_id)
+        if not pending:
+            self.job_tracker.mark_many_complete(
+                "filter", [(person_id, topic, list(processed)) for topic in topics]
+            )
 
-            # Mark all topics as filter_complete
-            for topic in topics:
-                self.job_tracker.mark_filter_complete(person_id, topic, [batch_id])
+        self.console.print(
+            f"[green]✓ Processed batch {batch_id} (person_id {person_id}): "
+            f"{sum(len(s) for s in all_by_topic.values())} speeches saved across {len(all_by_topic)} topics[/green]"
+        )
 
-            self.console.print(
-                f"[green]✓ Processed batch {batch_id}: "
-                f"{sum(len(s) for s in all_by_topic.values())} speeches saved across {len(all_by_topic)} topics[/green]"
-            )
+    def _add_filtered_rows(
+        self,
+        parsed: List[Tuple[int, Dict]],
+        all_by_topic: Dict[str, List[Tuple[int, str, int]]],
+    ):
+        """Look up texts for parsed results and group the rows by topic.
 
-        except Exception as e:
-            self.console.print(f"[red]Error processing batch {batch_id}: {e}[/red]")
-            import traceback
+        Args:
+            parsed: List of (speech_id, relevance_scores) tuples
+            all_by_topic: Rows grouped by topic, extended in place
+        """
+        speech_map = self.database.get_speeches_by_ids(
+            [speech_id for speech_id, _ in parsed]
+        )
+        # Cache each topic's bound append method for the inner loop
+        appenders = {topic: rows.append for topic, rows in all_by_topic.items()}
 
-            traceback.print_exc()
-            raise
+        for speech_id, relevance_scores in parsed:
+            speech_text = speech_map.get(speech_id, "")
+            if not speech_text:
+                continue
+
+            for topic, score_data in relevance_scores.items():
+                append = appenders.get(topic)
+                if append is None:
+                    append = appenders[topic] = all_by_topic.setdefault(
+                        topic, []
+                    ).append
+                append((speech_id, speech_text, score_data.get("relevance", 0)))
 
     def _print_batch_error_details(self, batch_id: str):
         """Print detailed error information about a failed batch.
@@ -359,7 +418,7 @@ Respond with JSON only, format:
                     # Try to get error rate by retrieving results
                     file_response = self.batch_manager.client.files.content(batch.output_file_id)
                     content = file_response.read().decode("utf-8")
-                    results = [json.loads(line) for line in content.strip().split("\n") if line]
+                    results = [jsonio.loads(line) for line in content.strip().split("\n") if line]
                     
                     # Count error responses
                     error_count = sum(
@@ -382,26 +441,46 @@ Respond with JSON only, format:
         except Exception as e:
             self.console.print(f"[yellow]  Could not retrieve batch details: {e}[/yellow]")
 
-    def _save_filtered_speeches(self, person_id: int, topic: str, speeches: List[Dict]):
+    def _get_csv_writer(self, csv_path: Path) -> Tuple[TextIO, Any]:
+        """Get an open CSV writer for an intermediate file, opening it on first use.
+
+        Args:
+            csv_path: Path to the intermediate CSV
+
+        Returns:
+            Tuple of (file handle, csv writer)
+        """
+        entry = self._csv_files.get(csv_path)
+        if entry is None:
+            # Append mode to support multiple batches
+            file_exists = csv_path.exists()
+
+            f = open(csv_path, "a", newline="", encoding="utf-8", buffering=1 << 20)
+            writer = csv.writer(f)
+
+            if not file_exists:
+                writer.writerow(("Id", "Text", "RelevanceScore"))
+
+            entry = self._csv_files[csv_path] = (f, writer)
+
+        return entry
+
+    def _save_filtered_speeches(
+        self, person_id: int, topic: str, speeches: List[Tuple[int, str, int]]
+    ):
         """Save filtered speeches to intermediate CSV.
 
         Args:
             person_id: MK person_id
             topic: Topic name
-            speeches: List of speech dicts with Id, Text, RelevanceScore
+            speeches: List of (Id, Text, RelevanceScore) tuples
         """
         csv_path = self.intermediate_dir / f"{person_id}_{topic}_filtered.csv"
 
-        # Append mode to support multiple batches
-        file_exists = csv_path.exists()
-
-        with open(csv_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["Id", "Text", "RelevanceScore"])
-
-            if not file_exists:
-                writer.writeheader()
-
-            writer.writerows(speeches)
+        f, writer = self._get_csv_writer(csv_path)
+        writer.writerows(speeches)
+        # Make sure rows are on disk before the pair is marked filter_complete
+        f.flush()
 
         self.console.print(
             f"[green]Saved {len(speeches)} filtered speeches to {csv_path.name}[/green]"
@@ -1,43 +1,122 @@
 """Job tracking for filter and score phases per (person_id, topic) pair."""
 
-import json
+import sqlite3
+import time
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Optional
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
 
+from . import jsonio
+
 
 class JobTracker:
     """Tracks completion status of filter and score phases."""
 
+    # Changes are written at most this often (seconds); call flush() to force
+    FLUSH_INTERVAL = 5
+
     def __init__(self, status_path: Path = None):
         """Initialize job tracker.
 
         Args:
-            status_path: Path to job_status.json file
+            status_path: Path to job_status.db file (a job_status.json next to
+                it from earlier versions is imported on first use)
         """
         self.console = Console()
 
         if status_path is None:
-            status_path = Path.cwd() / "data" / "cache" / "job_status.json"
+            status_path = Path.cwd() / "data" / "cache" / "job_status.db"
 
         self.status_path = Path(status_path)
         self.status_path.parent.mkdir(parents=True, exist_ok=True)
 
+        self._conn = sqlite3.connect(self.status_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs "
+            "(key TEXT PRIMARY KEY, status TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+
         self._status: Dict[str, Dict] = {}
+        # Inverse index: status -> keys currently in that status
+        self._by_status: Dict[str, Set[str]] = defaultdict(set)
+        # Keys changed since the last save
+        self._dirty_keys: Set[str] = set()
+        self._last_flush = time.monotonic()
         self._load_status()
 
     def _load_status(self):
         """Load job status from disk."""
-        if self.status_path.exists():
-            with open(self.status_path, "r", encoding="utf-8") as f:
-                self._status = json.load(f)
+        self._status = {
+            key: jsonio.loads(data)
+            for key, data in self._conn.execute("SELECT key, data FROM jobs")
+        }
+
+        # Import the status file written by earlier versions
+        legacy_path = self.status_path.with_suffix(".json")
+        if not self._status and legacy_path.exists():
+            self._status = jsonio.loads(legacy_path.read_bytes())
+            self._dirty_keys.update(self._status)
+            self._save_status()
+
+        self._by_status.clear()
+        for key, data in self._status.items():
+            self._by_status[data["status"]].add(key)
+
+    def _reindex(self, key: str, status: str):
+        """Move a key to a new status in the inverse index.
+
+        Must be called before the status in _status is overwritten.
+
+        Args:
+            key: Pair key
+            status: New status
+        """
+        if key in self._status:
+            self._by_status[self._status[key]["status"]].discard(key)
+        self._by_status[status].add(key)
 
     def _save_status(self):
-        """Save job status to disk."""
-        with open(self.status_path, "w", encoding="utf-8") as f:
-            json.dump(self._status, f, ensure_ascii=False, indent=2)
+        """Save changed pairs to disk in a single transaction."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO jobs (key, status, data) VALUES (?, ?, ?)",
+                (
+                    (
+                        key,
+                        self._status[key]["status"],
+                        jsonio.dumps(self._status[key]).decode("utf-8"),
+                    )
+                    for key in self._dirty_keys
+                ),
+            )
+
+        self._dirty_keys.clear()
+        self._last_flush = time.monotonic()
+
+    def _mark_dirty(self, keys: Iterable[str]):
+        """Record unsaved changes, saving if the last save is old enough.
+
+        Args:
+            keys: Keys of the changed pairs
+        """
+        self._dirty_keys.update(keys)
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self._save_status()
+
+    def flush(self):
+        """Save job status to disk if there are unsaved changes."""
+        if self._dirty_keys:
+            self._save_status()
+
+    def close(self):
+        """Save unsaved changes and close the status database."""
+        self.flush()
+        self._conn.close()
 
     def _make_key(self, person_id: int, topic: str) -> str:
         """Create key for (person_id, topic) pair.
@@ -63,25 +142,17 @@ class JobTracker:
         Returns:
             List of pairs needing processing
         """
-        pending = []
-
-        for person_id, topic in all_pairs:
-            key = self._make_key(person_id, topic)
+        make_key = self._make_key
+        filter_complete = self._by_status["filter_complete"]
 
-            if key not in self._status:
-                # New pair - needs processing
-                if phase == "filter":
-                    pending.append((person_id, topic))
-                continue
-
-            status = self._status[key]["status"]
-
-            if phase == "filter" and status == "pending":
-                pending.append((person_id, topic))
-            elif phase == "score" and status == "filter_complete":
-                pending.append((person_id, topic))
+        if phase == "filter":
+            # New pairs and pairs reset to pending
+            done = filter_complete | self._by_status["score_complete"]
+            return [pair for pair in all_pairs if make_key(*pair) not in done]
+        elif phase == "score":
+            return [pair for pair in all_pairs if make_key(*pair) in filter_complete]
 
-        return pending
+        return []
 
     def mark_filter_complete(
         self, person_id: int, topic: str, batch_job_ids: List[str]
@@ -94,17 +165,9 @@ class JobTracker:
             batch_job_ids: List of batch job IDs used
         """
         key = self._make_key(person_id, topic)
+        self._set_filter_complete(key, batch_job_ids, datetime.now().isoformat())
 
-        self._status[key] = {
-            "status": "filter_complete",
-            "filter_batch_job_ids": batch_job_ids,
-            "filter_completed_at": datetime.now().isoformat(),
-            "score_batch_job_ids": self._status.get(key, {}).get(
-                "score_batch_job_ids", []
-            ),
-        }
-
-        self._save_status()
+        self._mark_dirty((key,))
         self.console.print(
             f"[green]✓[/green] Filter complete: person_id={person_id}, topic={topic}"
         )
@@ -118,18 +181,79 @@ class JobTracker:
             batch_job_ids: List of batch job IDs used
         """
         key = self._make_key(person_id, topic)
+        self._set_score_complete(key, batch_job_ids, datetime.now().isoformat())
+
+        self._mark_dirty((key,))
+        self.console.print(
+            f"[green]✓[/green] Score complete: person_id={person_id}, topic={topic}"
+        )
+
+    def mark_many_complete(
+        self, phase: str, pairs_and_ids: List[Tuple[int, str, List[str]]]
+    ):
+        """Mark a phase as complete for many pairs, sharing one timestamp.
+
+        Args:
+            phase: "filter" or "score"
+            pairs_and_ids: (person_id, topic, batch_job_ids) per pair
+        """
+        if phase == "filter":
+            set_complete = self._set_filter_complete
+        elif phase == "score":
+            set_complete = self._set_score_complete
+        else:
+            raise ValueError(f"Unknown phase: {phase}")
+
+        completed_at = datetime.now().isoformat()
+        keys = []
+        for person_id, topic, batch_job_ids in pairs_and_ids:
+            key = self._make_key(person_id, topic)
+            set_complete(key, batch_job_ids, completed_at)
+            keys.append(key)
+
+        self._mark_dirty(keys)
+        self.console.print(
+            f"[green]✓[/green] {phase.capitalize()} complete: {len(keys)} pairs"
+        )
+
+    def _set_filter_complete(
+        self, key: str, batch_job_ids: List[str], completed_at: str
+    ):
+        """Record a completed filter phase for a pair (without saving).
+
+        Args:
+            key: Pair key
+            batch_job_ids: List of batch job IDs used
+            completed_at: ISO completion timestamp
+        """
+        self._reindex(key, "filter_complete")
+        self._status[key] = {
+            "status": "filter_complete",
+            "filter_batch_job_ids": batch_job_ids,
+            "filter_completed_at": completed_at,
+            "score_batch_job_ids": self._status.get(key, {}).get(
+                "score_batch_job_ids", []
+            ),
+        }
+
+    def _set_score_complete(
+        self, key: str, batch_job_ids: List[str], completed_at: str
+    ):
+        """Record a completed score phase for a pair (without saving).
+
+        Args:
+            key: Pair key
+            batch_job_ids: List of batch job IDs used
+            completed_at: ISO completion timestamp
+        """
+        self._reindex(key, "score_complete")
 
         if key not in self._status:
             self._status[key] = {"status": "pending"}
 
         self._status[key]["status"] = "score_complete"
         self._status[key]["score_batch_job_ids"] = batch_job_ids
-        self._status[key]["score_completed_at"] = datetime.now().isoformat()
-
-        self._save_status()
-        self.console.print(
-            f"[green]✓[/green] Score complete: person_id={person_id}, topic={topic}"
-        )
+        self._status[key]["score_completed_at"] = completed_at
 
     def is_pair_complete(self, person_id: int, topic: str, phase: str) -> bool:
         """Check if a pair is complete for a phase.
@@ -163,23 +287,41 @@ class JobTracker:
             pairs: List of (person_id, topic) pairs to reset
             phase: If "filter", reset to pending; if "score", reset to filter_complete
         """
+        reset_keys = []
         for person_id, topic in pairs:
             key = self._make_key(person_id, topic)
 
             if phase == "filter" or phase is None:
+                self._reindex(key, "pending")
                 self._status[key] = {"status": "pending"}
+                reset_keys.append(key)
             elif phase == "score":
                 if (
                     key in self._status
                     and self._status[key]["status"] == "score_complete"
                 ):
+                    self._reindex(key, "filter_complete")
                     self._status[key]["status"] = "filter_complete"
+                    reset_keys.append(key)
 
-        self._save_status()
+        self._mark_dirty(reset_keys)
         self.console.print(
             f"[yellow]Reset {len(pairs)} pairs for phase: {phase or 'all'}[/yellow]"
         )
 
+    def iter_by_status(self, status: str) -> Iterator[Tuple[int, str]]:
+        """Iterate over pairs currently in a given status.
+
+        Args:
+            status: "pending", "filter_complete" or "score_complete"
+
+        Yields:
+            (person_id, topic) pairs
+        """
+        for key in self._by_status.get(status, ()):
+            person_id, topic = key.split("_", 1)
+            yield int(person_id), topic
+
     def get_statistics(self) -> Dict[str, int]:
         """Get statistics on job status.
 
@@ -0,0 +1,43 @@
+"""JSON helpers that use orjson when it is installed."""
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+    import json
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document.
+
+    Args:
+        data: UTF-8 encoded bytes or text
+
+    Returns:
+        Parsed JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize a value to UTF-8 JSON, keeping non-ASCII text readable.
+
+    Args:
+        obj: Value to serialize
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode(
+        "utf-8"
+    )
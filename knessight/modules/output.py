@@ -1,13 +1,13 @@
 """Output aggregation and JSON generation."""
 
 import csv
-import json
+import os
 from pathlib import Path
-from typing import List, Dict
-from statistics import mean
+from typing import List, Dict, Set
 
 from rich.console import Console
 
+from . import jsonio
 from .database import Database
 
 
@@ -34,6 +34,10 @@ class OutputManager:
         self.mk_data_dir.mkdir(parents=True, exist_ok=True)
         self.topics_dir.mkdir(parents=True, exist_ok=True)
 
+        # Topic aggregations are kept in memory and written by flush_topics()
+        self._topic_cache: Dict[str, Dict] = {}
+        self._topic_dirty: Set[str] = set()
+
     def update_aggregations(
         self, person_id: int, topic: str, scored_speeches: List[Dict]
     ):
@@ -49,8 +53,7 @@ class OutputManager:
 
         # Calculate statistics
         count = len(scored_speeches)
-        ranks = [speech["Rank"] for speech in scored_speeches]
-        average = mean(ranks)
+        average = sum(speech["Rank"] for speech in scored_speeches) / count
 
         # Update MK main.json
         self._update_mk_json(person_id, topic, count, average)
@@ -58,10 +61,6 @@ class OutputManager:
         # Update topic aggregation JSON
         self._update_topic_json(topic, person_id, count, average)
 
-        self.console.print(
-            f"[green]Updated aggregations for person_id={person_id}, topic={topic} (count={count}, avg={average:.2f})[/green]"
-        )
-
     def _update_mk_json(self, person_id: int, topic: str, count: int, average: float):
         """Update or create MK's main.json.
 
@@ -78,8 +77,7 @@ class OutputManager:
 
         # Load existing or create new
         if json_path.exists():
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = jsonio.loads(json_path.read_bytes())
         else:
             # Get MK metadata from database
             metadata = self.database.get_person_metadata(person_id)
@@ -112,14 +110,12 @@ class OutputManager:
                 {"topicName": topic, "count": count, "average": round(average, 2)}
             )
 
-        # Save
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json(json_path, data, indent=True)
 
     def _update_topic_json(
         self, topic: str, person_id: int, count: int, average: float
     ):
-        """Update or create topic aggregation JSON.
+        """Update or create topic aggregation (written by flush_topics).
 
         Args:
             topic: Topic name
@@ -127,21 +123,39 @@ class OutputManager:
             count: Number of speeches
             average: Average stance score
         """
-        json_path = self.topics_dir / f"{topic}.json"
+        data = self._topic_cache.get(topic)
+        if data is None:
+            json_path = self.topics_dir / f"{topic}.json"
 
-        # Load existing or create new
-        if json_path.exists():
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        else:
-            data = {}
+            # Load existing or create new
+            if json_path.exists():
+                data = jsonio.loads(json_path.read_bytes())
+            else:
+                data = {}
+            self._topic_cache[topic] = data
 
         # Update or add MK
         data[str(person_id)] = [count, round(average, 2)]
+        self._topic_dirty.add(topic)
 
-        # Save
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def flush_topics(self):
+        """Write topic aggregation JSONs changed since the last flush."""
+        for topic in self._topic_dirty:
+            json_path = self.topics_dir / f"{topic}.json"
+            self._write_json(json_path, self._topic_cache[topic])
+        self._topic_dirty.clear()
+
+    def _write_json(self, json_path: Path, data: Dict, indent: bool = False):
+        """Write a JSON file atomically, via a temp file.
+
+        Args:
+            json_path: Destination path
+            data: JSON-serializable data
+            indent: Pretty-print (for files meant to be read by people)
+        """
+        tmp_path = json_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(jsonio.dumps(data, indent=indent))
+        os.replace(tmp_path, json_path)
 
     # TODO: delete this, we dont need it.
     def generate_mks_csv(self, person_ids: List[int]):
@@ -157,28 +171,21 @@ class OutputManager:
             metadata = self.database.get_person_metadata(person_id)
             if metadata:
                 rows.append(
-                    {
-                        "id": person_id,
-                        "first name": metadata["first_name"],
-                        "last name": metadata["surname"],
-                        "knesset site id": person_id,
-                        "image url": "",  # Empty initially
-                    }
+                    (
+                        person_id,
+                        metadata["first_name"],
+                        metadata["surname"],
+                        person_id,
+                        "",  # Empty initially
+                    )
                 )
 
         with open(csv_path, "w", newline="", encoding="utf-8") as f:
             if rows:
-                writer = csv.DictWriter(
-                    f,
-                    fieldnames=[
-                        "id",
-                        "first name",
-                        "last name",
-                        "knesset site id",
-                        "image url",
-                    ],
+                writer = csv.writer(f)
+                writer.writerow(
+                    ("id", "first name", "last name", "knesset site id", "image url")
                 )
-                writer.writeheader()
                 writer.writerows(rows)
 
         self.console.print(f"[green]Generated mks.csv with {len(rows)} MKs[/green]")
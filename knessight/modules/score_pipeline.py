@@ -1,13 +1,16 @@
 """Phase 2: Score pipeline - stance scoring with reasoning sampling."""
 
 import csv
-import json
 import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
 from rich.console import Console
+from rich.progress import BarColumn, Progress, TextColumn, TimeElapsedColumn
 
+from . import jsonio
 from .config import Config
 from .database import Database
 from .batch_manager import BatchManager
@@ -18,6 +21,15 @@ from .output import OutputManager
 class ScorePipeline:
     """Handles Phase 2: scoring stance on topics with optional reasoning."""
 
+    # Pairs (and completed batches) processed concurrently
+    PAIR_WORKERS = 8
+
+    # Shared by every scoring request (never mutated)
+    SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": "You are a political speech analyst. Score stance on topics from 1 (strongly opposes) to 10 (strongly supports). Respond with JSON only.",
+    }
+
     def __init__(
         self,
         config: Config,
@@ -72,12 +84,20 @@ class ScorePipeline:
             f"[cyan]Starting score pipeline for {len(pairs)} pairs (reasoning rate: {reasoning_rate:.1%})[/cyan]"
         )
 
-        # Process each pair
+        # Process pairs concurrently; their requests share the batch queue
         all_batch_ids = []
 
-        for person_id, topic in pairs:
-            batch_ids = self._process_pair(person_id, topic, reasoning_rate)
-            all_batch_ids.extend(batch_ids)
+        with ThreadPoolExecutor(max_workers=self.PAIR_WORKERS) as executor:
+            with self._progress() as progress:
+                task = progress.add_task("[cyan]Queueing pairs", total=len(pairs))
+                for batch_ids in executor.map(
+                    lambda pair: self._process_pair(*pair, reasoning_rate), pairs
+                ):
+                    all_batch_ids.extend(batch_ids)
+                    progress.advance(task)
+
+        # Submit the last, partially filled batch
+        all_batch_ids.extend(self.batch_manager.flush())
 
         # Poll for completion
         if all_batch_ids:
@@ -88,15 +108,70 @@ class ScorePipeline:
                 all_batch_ids, self.config.BATCH_POLL_INTERVAL
             )
 
-            # Process results
+            # Process results, collecting each pair's speeches across batches
+            # since coalesced batches can split a pair
+            scored_by_pair = defaultdict(list)
+            batch_ids_by_pair = defaultdict(list)
+
+            completed_ids = []
             for batch_id, status in results.items():
                 if status == "completed":
-                    self._process_batch_results(batch_id)
+                    completed_ids.append(batch_id)
                 else:
                     self.console.print(
                         f"[red]Batch {batch_id} failed with status: {status}[/red]"
                     )
 
+            # Download and parse completed batches concurrently
+            with ThreadPoolExecutor(max_workers=self.PAIR_WORKERS) as executor:
+                for batch_id, pair_results in zip(
+                    completed_ids,
+                    executor.map(self._process_batch_results, completed_ids),
+                ):
+                    for person_id, topic, scored_speeches in pair_results:
+                        scored_by_pair[(person_id, topic)].extend(scored_speeches)
+                        batch_ids_by_pair[(person_id, topic)].append(batch_id)
+
+            with self._progress() as progress:
+                task = progress.add_task(
+                    "[cyan]Saving scored pairs", total=len(scored_by_pair)
+                )
+                for (person_id, topic), scored_speeches in scored_by_pair.items():
+                    self._finalize_pair(person_id, topic, scored_speeches)
+                    progress.advance(task)
+
+            all_scored = [s for speeches in scored_by_pair.values() for s in speeches]
+            reasoning_count = sum(1 for s in all_scored if s["Reasoning"])
+            self.console.print(
+                f"[green]Saved {len(all_scored)} scored speeches for {len(scored_by_pair)} pairs ({reasoning_count} with reasoning)[/green]"
+            )
+
+            # Mark all finalized pairs as score_complete
+            self.job_tracker.mark_many_complete(
+                "score",
+                [
+                    (person_id, topic, batch_ids)
+                    for (person_id, topic), batch_ids in batch_ids_by_pair.items()
+                ],
+            )
+
+            self.output_manager.flush_topics()
+            self.job_tracker.flush()
+
+    def _progress(self) -> Progress:
+        """Create a progress bar that prints through this pipeline's console.
+
+        Returns:
+            Progress display (use as a context manager)
+        """
+        return Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("({task.completed}/{task.total})"),
+            TimeElapsedColumn(),
+            console=self.console,
+        )
+
     def _process_pair(
         self, person_id: int, topic: str, reasoning_rate: float
     ) -> List[str]:
@@ -108,7 +183,8 @@ class ScorePipeline:
             reasoning_rate: Probability of requesting reasoning
 
         Returns:
-            List of batch job IDs created
+            List of batch job IDs submitted so far (requests are coalesced
+            with other pairs' into shared batches)
         """
         # Load filtered speeches
         csv_path = self.intermediate_dir / f"{person_id}_{topic}_filtered.csv"
@@ -119,80 +195,97 @@ class ScorePipeline:
             )
             return []
 
-        speeches = []
+        # Load scoring prompt
+        scoring_prompt = self.config.load_scoring_prompt(topic)
+        message_suffixes = self._build_user_message_suffixes(topic, scoring_prompt)
+        threshold = self.config.RELEVANCE_THRESHOLD
+
+        # Stream filtered speeches straight into the batch queue
+        metadata = {"phase": "score", "person_id": str(person_id), "topic": topic}
+        batch_ids = []
+        speech_count = 0
+        queued_count = 0
+
         with open(csv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            speeches = list(reader)
+            for speech_data in csv.DictReader(f):
+                speech_count += 1
+
+                # Filter by relevance threshold before scoring
+                if float(speech_data.get("RelevanceScore", 0)) < threshold:
+                    continue
+                queued_count += 1
+
+                # Random sampling for reasoning
+                include_reasoning = random.random() < reasoning_rate
+
+                request = self._build_scoring_request(
+                    int(speech_data["Id"]),
+                    speech_data["Text"],
+                    message_suffixes[include_reasoning],
+                    include_reasoning,
+                )
+                batch_ids.extend(
+                    self.batch_manager.enqueue_request(
+                        request, metadata, self.config.BATCH_SIZE
+                    )
+                )
 
-        if not speeches:
+        if not speech_count:
             self.console.print(
                 f"[yellow]Empty filtered speeches: {csv_path.name}[/yellow]"
             )
             return []
 
-        self.console.print(
-            f"[cyan]Scoring {len(speeches)} speeches for person_id {person_id}, topic: {topic}[/cyan]"
-        )
-
-        # Load scoring prompt
-        scoring_prompt = self.config.load_scoring_prompt(topic)
-
-        # Filter by relevance threshold before scoring
-        threshold = self.config.RELEVANCE_THRESHOLD
-        speeches_above_threshold = [
-            s for s in speeches if float(s.get("RelevanceScore", 0)) >= threshold
-        ]
-
-        if not speeches_above_threshold:
+        if not queued_count:
             self.console.print(
                 f"[yellow]No speeches above threshold ({threshold}) for scoring: {csv_path.name}[/yellow]"
             )
-            return []
 
-        self.console.print(
-            f"[cyan]Scoring {len(speeches_above_threshold)} speeches above threshold for person_id {person_id}, topic: {topic}[/cyan]"
-        )
+        return batch_ids
 
-        # Build scoring requests only for speeches above threshold
-        requests = []
-        for speech_data in speeches_above_threshold:
-            speech_id = int(speech_data["Id"])
-            text = speech_data["Text"]
+    def _build_user_message_suffixes(
+        self, topic: str, scoring_prompt: str
+    ) -> Tuple[str, str]:
+        """Render the part of the user message that follows the speech text.
 
-            # Random sampling for reasoning
-            include_reasoning = random.random() < reasoning_rate
+        It only depends on the topic, so it is built once per pair.
 
-            request = self._build_scoring_request(
-                speech_id, text, topic, scoring_prompt, include_reasoning
-            )
-            requests.append(request)
+        Args:
+            topic: Topic name
+            scoring_prompt: Scoring prompt for this topic
 
-        # Split into batches
-        batch_ids = []
-        batch_size = self.config.BATCH_SIZE
-
-        for i in range(0, len(requests), batch_size):
-            batch_requests = requests[i : i + batch_size]
-
-            batch_id = self.batch_manager.create_batch(
-                batch_requests,
-                metadata={
-                    "phase": "score",
-                    "person_id": str(person_id),
-                    "topic": topic,
-                    "batch_index": str(i // batch_size),
-                },
+        Returns:
+            (suffix without reasoning, suffix with reasoning), indexable by
+            include_reasoning
+        """
+        suffixes = []
+        for include_reasoning in (False, True):
+            reasoning_instruction = ""
+            if include_reasoning:
+                reasoning_instruction = (
+                    "\nAlso provide a one-sentence reasoning for your score."
+                )
+
+            suffixes.append(
+                f"""
+
+Topic: {topic}
+
+{scoring_prompt}{reasoning_instruction}
+
+Respond with JSON only, format:
+{{
+  "stance_score": 1-10{', "reasoning": "one sentence"' if include_reasoning else ''}
+}}"""
             )
-            batch_ids.append(batch_id)
 
-        return batch_ids
+        return suffixes[0], suffixes[1]
 
     def _build_scoring_request(
         self,
         speech_id: int,
         text: str,
-        topic: str,
-        scoring_prompt: str,
+        message_suffix: str,
         include_reasoning: bool,
     ) -> Dict:
         """Build a single scoring request for Batch API.
@@ -200,31 +293,13 @@ class ScorePipeline:
         Args:
             speech_id: Speech ID
             text: Speech text
-            topic: Topic name
-            scoring_prompt: Scoring prompt for this topic
+            message_suffix: Pre-rendered user message suffix for the topic
+                (see _build_user_message_suffixes)
             include_reasoning: Whether to request reasoning
 
         Returns:
             Batch API request object
         """
-        reasoning_instruction = ""
-        if include_reasoning:
-            reasoning_instruction = (
-                "\nAlso provide a one-sentence reasoning for your score."
-            )
-
-        user_message = f"""Speech Text:
-{text}
-
-Topic: {topic}
-
-{scoring_prompt}{reasoning_instruction}
-
-Respond with JSON only, format:
-{{
-  "stance_score": 1-10{', "reasoning": "one sentence"' if include_reasoning else ''}
-}}"""
-
         return {
             "custom_id": f"score_{speech_id}_{int(include_reasoning)}",
             "method": "POST",
@@ -232,124 +307,170 @@ Respond with JSON only, format:
             "body": {
                 "model": "gpt-4o-mini",
                 "messages": [
+                    self.SYSTEM_MESSAGE,
                     {
-                        "role": "system",
-                        "content": "You are a political speech analyst. Score stance on topics from 1 (strongly opposes) to 10 (strongly supports). Respond with JSON only.",
+                        "role": "user",
+                        "content": "Speech Text:\n" + text + message_suffix,
                     },
-                    {"role": "user", "content": user_message},
                 ],
                 "response_format": {"type": "json_object"},
                 "temperature": 0.3,
             },
         }
 
-    def _process_batch_results(self, batch_id: str):
-        """Process completed scoring batch and save results.
+    def _process_batch_results(
+        self, batch_id: str
+    ) -> List[Tuple[int, str, List[Dict]]]:
+        """Parse a completed scoring batch.
 
         Args:
             batch_id: Completed batch job ID
+
+        Returns:
+            List of (person_id, topic, scored_speeches) per pair in the batch
         """
         try:
-            results = self.batch_manager.retrieve_results(batch_id)
+            pair_results = []
+            for batch_info, results in self.batch_manager.retrieve_grouped_results(
+                batch_id
+            ):
+                pair_result = self._process_pair_results(batch_id, batch_info, results)
+                if pair_result:
+                    pair_results.append(pair_result)
+            return pair_results
 
-            # Get metadata
-            batch_info = self.batch_manager._batch_jobs.get(batch_id, {})
-            person_id = batch_info.get("person_id")
-            topic = batch_info.get("topic")
+        except Exception as e:
+            self.console.print(f"[red]Error processing batch {batch_id}: {e}[/red]")
+            return []
 
-            # Convert person_id from string back to int
-            if person_id:
-                person_id = int(person_id)
+    def _process_pair_results(
+        self, batch_id: str, batch_info: Dict, results: List[Dict]
+    ) -> Optional[Tuple[int, str, List[Dict]]]:
+        """Parse one pair's results from a completed scoring batch.
 
-            if not person_id or not topic:
-                self.console.print(f"[red]Missing metadata for batch {batch_id}[/red]")
-                return
+        Args:
+            batch_id: Completed batch job ID
+            batch_info: Metadata of the originating pair (person_id, topic)
+            results: That pair's results from the batch
 
-            # Collect scored speeches with reasoning
-            scored_speeches = []
+        Returns:
+            (person_id, topic, scored_speeches), or None if metadata is missing
+        """
+        # Get metadata
+        person_id = batch_info.get("person_id")
+        topic = batch_info.get("topic")
 
-            for result in results:
-                if result.get("response", {}).get("status_code") != 200:
-                    continue
+        # Convert person_id from string back to int
+        if person_id:
+            person_id = int(person_id)
 
-                # Extract speech_id from custom_id
-                custom_id = result.get("custom_id", "")
-                if not custom_id.startswith("score_"):
-                    continue
+        if not person_id or not topic:
+            self.console.print(f"[red]Missing metadata for batch {batch_id}[/red]")
+            return None
 
-                parts = custom_id.split("_")
-                speech_id = int(parts[1])
-                has_reasoning = bool(int(parts[2]))
+        # Parse scores first, so metadata can be fetched in one lookup
+        parsed_scores = []
 
-                # Parse response
-                try:
-                    response_body = result["response"]["body"]
-                    content = response_body["choices"][0]["message"]["content"]
-                    score_data = json.loads(content)
+        for result in results:
+            if result.get("response", {}).get("status_code") != 200:
+                continue
 
-                    stance_score = score_data.get("stance_score")
-                    reasoning = score_data.get("reasoning")
+            # Extract speech_id from custom_id
+            custom_id = result.get("custom_id", "")
+            if not custom_id.startswith("score_"):
+                continue
 
-                    if stance_score is None:
-                        continue
+            # "score_{speech_id}_{0|1}": slice instead of split
+            speech_id = int(custom_id[6:-2])
+            has_reasoning = custom_id[-1] == "1"
 
-                    # Get speech metadata
-                    metadata = self.database.get_speech_metadata(speech_id)
-                    if not metadata:
-                        continue
+            # Parse response
+            try:
+                response_body = result["response"]["body"]
+                content = response_body["choices"][0]["message"]["content"]
+                score_data = jsonio.loads(content)
 
-                    # Load speech text from intermediate file # TODO: optimize by caching CSV contents per person_id/topic
-                    csv_path = (
-                        self.intermediate_dir / f"{person_id}_{topic}_filtered.csv"
-                    )
-                    speech_text = self._get_speech_text_from_csv(csv_path, speech_id)
-
-                    scored_speeches.append(
-                        {
-                            "Id": speech_id,
-                            "Date": metadata["date"],
-                            "Topic": topic,
-                            "Text": speech_text,
-                            "Rank": stance_score,
-                            "Reasoning": (
-                                reasoning if (has_reasoning and reasoning) else ""
-                            ),
-                        }
-                    )
+                stance_score = score_data.get("stance_score")
+                reasoning = score_data.get("reasoning")
 
-                except (json.JSONDecodeError, KeyError, ValueError) as e:
-                    self.console.print(
-                        f"[red]Error parsing result for speech {speech_id}: {e}[/red]"
-                    )
+                if stance_score is None:
                     continue
 
-            # Save scored speeches with reasoning included
-            if scored_speeches:
-                self._save_scored_speeches(person_id, topic, scored_speeches)
+                parsed_scores.append(
+                    (
+                        speech_id,
+                        stance_score,
+                        reasoning if (has_reasoning and reasoning) else "",
+                    )
+                )
+
+            # ValueError also covers json/orjson decode errors
+            except (KeyError, ValueError) as e:
+                self.console.print(
+                    f"[red]Error parsing result for speech {speech_id}: {e}[/red]"
+                )
+                continue
+
+        # Get speech metadata
+        metadata_by_id = self.database.get_speech_metadata_many(
+            [speech_id for speech_id, _, _ in parsed_scores]
+        )
 
-            # Mark as score_complete and trigger aggregation
-            self.job_tracker.mark_score_complete(person_id, topic, [batch_id])
-            self.output_manager.update_aggregations(person_id, topic, scored_speeches)
+        # Collect scored speeches with reasoning
+        scored_speeches = []
+
+        for speech_id, stance_score, reasoning in parsed_scores:
+            metadata = metadata_by_id.get(speech_id)
+            if not metadata:
+                continue
+
+            scored_speeches.append(
+                {
+                    "Id": speech_id,
+                    "Date": metadata["date"],
+                    "Topic": topic,
+                    "Text": "",  # Filled in by _finalize_pair
+                    "Rank": stance_score,
+                    "Reasoning": reasoning,
+                }
+            )
 
-        except Exception as e:
-            self.console.print(f"[red]Error processing batch {batch_id}: {e}[/red]")
+        return person_id, topic, scored_speeches
 
-    def _get_speech_text_from_csv(self, csv_path: Path, speech_id: int) -> str:
-        """Get speech text from intermediate CSV.
+    def _finalize_pair(self, person_id: int, topic: str, scored_speeches: List[Dict]):
+        """Save a pair's scored speeches and aggregate them.
+
+        Args:
+            person_id: MK person_id
+            topic: Topic name
+            scored_speeches: All scored speech dicts for the pair
+        """
+        # Save scored speeches with reasoning included
+        if scored_speeches:
+            # Load speech texts from intermediate file once for the whole pair,
+            # however many batches its results were split across
+            csv_path = self.intermediate_dir / f"{person_id}_{topic}_filtered.csv"
+            speech_texts = self._load_speech_texts(csv_path)
+            for speech in scored_speeches:
+                speech["Text"] = speech_texts.get(speech["Id"], "")
+
+            self._save_scored_speeches(person_id, topic, scored_speeches)
+
+        # Trigger aggregation
+        self.output_manager.update_aggregations(person_id, topic, scored_speeches)
+
+    def _load_speech_texts(self, csv_path: Path) -> Dict[int, str]:
+        """Load speech texts from intermediate CSV.
 
         Args:
             csv_path: Path to filtered CSV
-            speech_id: Speech ID
 
         Returns:
-            Speech text
+            Dictionary mapping speech_id to speech text
         """
         with open(csv_path, "r", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                if int(row["Id"]) == speech_id:
-                    return row["Text"]
-        return ""
+            return {int(row["Id"]): row["Text"] for row in reader}
 
     def _save_scored_speeches(self, person_id: int, topic: str, speeches: List[Dict]):
         """Save scored speeches to final CSV.
@@ -365,14 +486,9 @@ Respond with JSON only, format:
         csv_path = mk_dir / f"{topic}.csv"
 
         with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f, fieldnames=["Id", "Date", "Topic", "Text", "Rank", "Reasoning"]
+            writer = csv.writer(f)
+            writer.writerow(("Id", "Date", "Topic", "Text", "Rank", "Reasoning"))
+            writer.writerows(
+                (s["Id"], s["Date"], s["Topic"], s["Text"], s["Rank"], s["Reasoning"])
+                for s in speeches
             )
-            writer.writeheader()
-            writer.writerows(speeches)
-
-        # Count how many have reasoning
-        reasoning_count = sum(1 for s in speeches if s.get("Reasoning"))
-        self.console.print(
-            f"[green]Saved {len(speeches)} scored speeches to {csv_path} ({reasoning_count} with reasoning)[/green]"
-        )
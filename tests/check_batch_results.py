@@ -5,7 +5,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import json
-from src.modules.batch_manager import BatchManager
+from knessight.modules.batch_manager import BatchManager
 
 
 def check_batch_results():
@@ -23,7 +23,7 @@ def check_batch_results():
     print(f"Batch info: {json.dumps(bm._batch_jobs[latest_batch_id], indent=2)}\n")
 
     # Get results
-    results = bm.retrieve_results(latest_batch_id)
+    results = list(bm.retrieve_results(latest_batch_id))
     print(f"Total results: {len(results)}\n")
 
     if results:
@@ -0,0 +1,29 @@
+"""Shared fixtures for the test suite."""
+
+from pathlib import Path
+from dotenv import load_dotenv
+import pytest
+
+# Load .env file once for the whole session
+load_dotenv()
+
+from knessight.modules.config import get_config
+from knessight.modules.database import Database
+
+
+@pytest.fixture(scope="session")
+def config():
+    """Configuration loaded from the environment."""
+    return get_config()
+
+
+@pytest.fixture(scope="session")
+def database(config):
+    """Database connection shared by every test in the session."""
+    db_path = Path(config.DATABASE_PATH)
+    if not db_path.exists():
+        pytest.skip(f"Database not found: {db_path}")
+
+    database = Database(db_path)
+    yield database
+    database.close()
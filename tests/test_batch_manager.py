@@ -0,0 +1,145 @@
+"""Test batch bookkeeping with a fake OpenAI client (no API calls)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from knessight.modules import jsonio
+from knessight.modules.batch_manager import BatchManager
+
+
+class FakeFiles:
+    """Stands in for client.files, keeping uploads in memory."""
+
+    def __init__(self):
+        self.uploads = {}
+
+    def create(self, file, purpose):
+        file_id = f"file_{len(self.uploads)}"
+        self.uploads[file_id] = file[1]
+        return SimpleNamespace(id=file_id)
+
+    def content(self, file_id):
+        return SimpleNamespace(read=lambda: self.uploads[file_id])
+
+
+class FakeBatches:
+    """Stands in for client.batches, remembering created batches."""
+
+    def __init__(self):
+        self.batches = {}
+
+    def create(self, input_file_id, endpoint, completion_window, metadata):
+        batch_id = f"batch_{len(self.batches)}"
+        self.batches[batch_id] = SimpleNamespace(
+            id=batch_id, input_file_id=input_file_id, metadata=metadata
+        )
+        return self.batches[batch_id]
+
+    def retrieve(self, batch_id):
+        return self.batches[batch_id]
+
+
+@pytest.fixture
+def make_batch_manager(tmp_path, monkeypatch):
+    """Factory for BatchManagers sharing one cache/logs directory."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    managers = []
+
+    def make():
+        batch_manager = BatchManager(tmp_path / "cache", tmp_path / "logs")
+        managers.append(batch_manager)
+        return batch_manager
+
+    yield make
+    for batch_manager in managers:
+        if not batch_manager._batch_jobs_log.closed:
+            batch_manager.close()
+
+
+def test_load_replays_log_over_snapshot(make_batch_manager):
+    """Test that NDJSON changes are applied on top of batch_jobs.json."""
+    batch_manager = make_batch_manager()
+    batch_manager.batch_jobs_path.write_bytes(
+        jsonio.dumps({"batch_0": {"status": "submitted", "phase": "filter"}})
+    )
+    events = [
+        {"id": "batch_0", "patch": {"status": "completed"}},
+        {"id": "batch_1", "patch": {"status": "submitted"}},
+        {"id": "batch_1", "patch": {"output_file_id": "file_9"}},
+    ]
+    batch_manager.batch_jobs_log_path.write_bytes(
+        b"".join(jsonio.dumps(event) + b"\n" for event in events)
+        # Last line cut short by a crash mid-write
+        + b'{"id": "batch_1", "patch": {"status": "fai'
+    )
+
+    batch_manager._load_data()
+
+    assert batch_manager._batch_jobs == {
+        "batch_0": {"status": "completed", "phase": "filter"},
+        "batch_1": {"status": "submitted", "output_file_id": "file_9"},
+    }
+
+
+def test_close_compacts_log(make_batch_manager):
+    """Test that closing folds the change log into the snapshot."""
+    batch_manager = make_batch_manager()
+    batch_manager._append_batch_event("batch_0", {"status": "completed"})
+    batch_manager.close()
+
+    assert not batch_manager.batch_jobs_log_path.exists()
+    assert make_batch_manager()._batch_jobs == {"batch_0": {"status": "completed"}}
+
+
+@pytest.fixture
+def fake_batch_manager(make_batch_manager):
+    """BatchManager whose client records batches in memory."""
+    batch_manager = make_batch_manager()
+    batch_manager.client.close()
+    files, batches = FakeFiles(), FakeBatches()
+    batch_manager.client = SimpleNamespace(
+        files=files, batches=batches, close=lambda: None
+    )
+
+    def retrieve_results(batch_id):
+        # Echo every submitted request back as a successful result
+        payload = files.uploads[batches.batches[batch_id].input_file_id]
+        for line in payload.splitlines():
+            request = jsonio.loads(line)
+            yield {"custom_id": request["custom_id"], "response": {"status_code": 200}}
+
+    batch_manager.retrieve_results = retrieve_results
+    return batch_manager
+
+
+def test_grouped_results_round_trip(fake_batch_manager):
+    """Test that coalesced results are split back per pair without prefixes."""
+    batch_ids = []
+    for person_id in ("1", "2"):
+        for speech_id in range(3):
+            batch_ids += fake_batch_manager.enqueue_request(
+                {"custom_id": f"speech_{person_id}{speech_id}"},
+                {"phase": "filter", "person_id": person_id, "topics": ["a"]},
+                4,
+            )
+    assert len(batch_ids) == 1
+    batch_ids += fake_batch_manager.flush()
+
+    grouped = [
+        (group["person_id"], [result["custom_id"] for result in results])
+        for batch_id in batch_ids
+        for group, results in fake_batch_manager.retrieve_grouped_results(batch_id)
+    ]
+    assert grouped == [
+        ("1", ["speech_10", "speech_11", "speech_12"]),
+        ("2", ["speech_20"]),
+        ("2", ["speech_21", "speech_22"]),
+    ]
+
+    # Without batch_jobs.json the group map comes back from the uploaded file
+    fake_batch_manager._batch_jobs.clear()
+    assert [
+        group["person_id"]
+        for group in fake_batch_manager.get_batch_groups(batch_ids[0])
+    ] == ["1", "2"]
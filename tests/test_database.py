@@ -0,0 +1,33 @@
+"""Test id chunking for IN lists (no database needed)."""
+
+import pytest
+
+from knessight.modules.database import IN_LIST_BUCKETS, _in_list_chunks
+
+
+@pytest.mark.parametrize(
+    "count, sizes",
+    [
+        (0, []),
+        (1, [64]),
+        (64, [64]),
+        (65, [128]),
+        (500, [512]),
+        (999, [999]),
+        (1000, [999, 64]),
+        (2100, [999, 999, 128]),
+    ],
+)
+def test_chunks_padded_to_buckets(count, sizes):
+    """Test that chunks are padded with None to the next bucket size."""
+    ids = list(range(count))
+    chunks = list(_in_list_chunks(ids))
+
+    assert [len(params) for _, params in chunks] == sizes
+    for placeholders, params in chunks:
+        assert len(params) in IN_LIST_BUCKETS
+        assert placeholders == ",".join("?" * len(params))
+
+    params = [value for _, chunk in chunks for value in chunk]
+    assert [value for value in params if value is not None] == ids
+    assert params[count:] == [None] * (len(params) - count)
@@ -0,0 +1,71 @@
+"""Test MK name resolution scoring (no database needed)."""
+
+import pytest
+
+from knessight.modules.disambiguation import Disambiguation, _token_process
+
+# Candidates as search_people_by_names returns them (only the used fields)
+RABIN_CANDIDATES = [
+    {"person_id": 1, "name": "יצחק רבין"},
+    {"person_id": 2, "name": "יעל רבין"},
+    {"person_id": 3, "name": "יצחק הרצוג"},
+    {"person_id": 4, "name": "יצחק שמיר"},
+]
+
+
+@pytest.fixture
+def disambiguation(tmp_path, monkeypatch):
+    """Disambiguation that fails instead of prompting."""
+    disambiguation = Disambiguation(None, cache_path=tmp_path / "cache.json")
+
+    def fail_prompt(name, scored_candidates):
+        pytest.fail(f"'{name}' was not auto-selected: {scored_candidates[:3]}")
+
+    monkeypatch.setattr(disambiguation, "_interactive_disambiguation", fail_prompt)
+    return disambiguation
+
+
+# Resolved with fuzzywuzzy before the switch to rapidfuzz; reversed names
+# only reach the auto-select threshold through token_sort_ratio
+@pytest.mark.parametrize(
+    "name, candidates, person_id",
+    [
+        ("יצחק רבין", RABIN_CANDIDATES, 1),
+        ("רבין יצחק", RABIN_CANDIDATES, 1),
+        (
+            "בגין מנחם",
+            [
+                {"person_id": 9, "name": "מנחם בגין"},
+                {"person_id": 10, "name": "בני בגין"},
+            ],
+            9,
+        ),
+        (
+            "אהוד ברק",
+            [
+                {"person_id": 11, "name": "אהוד ברק"},
+                {"person_id": 12, "name": "אהוד אולמרט"},
+            ],
+            11,
+        ),
+        (
+            "ליברמן אביגדור",
+            [
+                {"person_id": 13, "name": "אביגדור ליברמן"},
+                {"person_id": 14, "name": "אביגדור קהלני"},
+            ],
+            13,
+        ),
+    ],
+)
+def test_resolved_person_ids_unchanged(disambiguation, name, candidates, person_id):
+    """Test that known Hebrew names resolve to the same MKs as before."""
+    assert disambiguation._resolve_single_name(name, candidates) == person_id
+
+
+def test_token_process_matches_fuzzywuzzy():
+    """Test that names are processed like fuzzywuzzy's full_process."""
+    assert _token_process("רבין, יצחק") == "רבין  יצחק"
+    assert _token_process("x_y") == "x_y"
+    # force_ascii drops U+0080-U+00FF only, so Hebrew stays
+    assert _token_process("josé\xa0cohen") == "joscohen"
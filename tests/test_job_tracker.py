@@ -0,0 +1,29 @@
+"""Test job status persistence (no database needed)."""
+
+from knessight.modules import jsonio
+from knessight.modules.job_tracker import JobTracker
+
+
+def test_imports_legacy_json(tmp_path):
+    """Test that job_status.json from earlier versions is imported once."""
+    status_path = tmp_path / "job_status.db"
+    status_path.with_suffix(".json").write_bytes(
+        jsonio.dumps(
+            {
+                "1_a": {"person_id": 1, "topic": "a", "status": "filter_complete"},
+                "2_a": {"person_id": 2, "topic": "a", "status": "pending"},
+            }
+        )
+    )
+    pairs = [(1, "a"), (2, "a"), (3, "a")]
+
+    job_tracker = JobTracker(status_path)
+    assert job_tracker.get_pending_pairs("filter", pairs) == [(2, "a"), (3, "a")]
+    assert job_tracker.get_pending_pairs("score", pairs) == [(1, "a")]
+    job_tracker.close()
+
+    # The import was saved, so a changed legacy file is no longer read
+    status_path.with_suffix(".json").write_bytes(jsonio.dumps({}))
+    job_tracker = JobTracker(status_path)
+    assert job_tracker.get_pending_pairs("filter", pairs) == [(2, "a"), (3, "a")]
+    job_tracker.close()
@@ -0,0 +1,46 @@
+"""Test JSON helpers with and without orjson (no database needed)."""
+
+import importlib
+import sys
+
+import pytest
+
+from knessight.modules import jsonio
+
+DOCUMENT = {"topic": "התיישבות", "ids": [1, 2, 3], "score": 7.5, "extra": None}
+
+
+@pytest.fixture
+def jsonio_without_orjson(monkeypatch):
+    """jsonio reloaded as if orjson were not installed."""
+    # A None entry makes "import orjson" raise ImportError
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    yield importlib.reload(jsonio)
+    monkeypatch.undo()
+    importlib.reload(jsonio)
+
+
+def check_round_trip(module):
+    """Check that dumps/loads round-trip and keep Hebrew readable."""
+    for indent in (False, True):
+        data = module.dumps(DOCUMENT, indent=indent)
+        assert isinstance(data, bytes)
+        assert "התיישבות".encode("utf-8") in data
+        assert module.loads(data) == DOCUMENT
+        assert module.loads(data.decode("utf-8")) == DOCUMENT
+
+    assert b"\n" not in module.dumps(DOCUMENT)
+    assert b"\n  " in module.dumps(DOCUMENT, indent=True)
+
+
+def test_round_trip_with_orjson():
+    """Test round-trip through orjson."""
+    pytest.importorskip("orjson")
+    assert jsonio.orjson is not None
+    check_round_trip(jsonio)
+
+
+def test_round_trip_without_orjson(jsonio_without_orjson):
+    """Test round-trip through the standard json fallback."""
+    assert jsonio_without_orjson.orjson is None
+    check_round_trip(jsonio_without_orjson)
@@ -1,17 +1,18 @@
 """Test model name configuration."""
 
-from dotenv import load_dotenv
 
-load_dotenv()
-
-from src.modules.config import Config
-
-config = Config()
-
-print("=" * 60)
-print("MODEL CONFIGURATION TEST")
-print("=" * 60)
-print(f"Filter Model:  {config.FILTER_MODEL_NAME}")
-print(f"Score Model:   {config.SCORE_MODEL_NAME}")
-print("=" * 60)
-print("✓ Model names loaded successfully")
+def test_model_config(config):
+    """Test that model names are loaded from the environment."""
+    print(
+        "\n".join(
+            [
+                "=" * 60,
+                "MODEL CONFIGURATION TEST",
+                "=" * 60,
+                f"Filter Model:  {config.FILTER_MODEL_NAME}",
+                f"Score Model:   {config.SCORE_MODEL_NAME}",
+                "=" * 60,
+                "✓ Model names loaded successfully",
+            ]
+        )
+    )
@@ -1,14 +1,14 @@
 """Validate configuration before running pipeline."""
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
-from src.modules.config import Config
-from src.modules.database import Database
-from src.modules.disambiguation import Disambiguation
+from knessight.modules.config import get_config
+from knessight.modules.database import Database
 
 
 def validate_configuration():
@@ -28,13 +28,19 @@ def validate_configuration():
         print(f"✓ API Key configured: {api_key[:15]}...")
 
     # Check config
-    config = Config()
+    config = get_config()
     print(f"✓ Filter Model: {config.FILTER_MODEL_NAME}")
     print(f"✓ Score Model: {config.SCORE_MODEL_NAME}")
     print(f"✓ Database: {config.DATABASE_PATH}")
 
+    # These only depend on config, so run them concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        config_errors_future = executor.submit(config.validate)
+        database_future = executor.submit(Database, Path(config.DATABASE_PATH))
+        descriptions_future = executor.submit(config.load_topic_descriptions)
+
     # Validate config
-    config_errors = config.validate()
+    config_errors = config_errors_future.result()
     if config_errors:
         errors.extend([f"❌ Config: {e}" for e in config_errors])
     else:
@@ -42,7 +48,7 @@ def validate_configuration():
 
     # Check database
     try:
-        database = Database(Path(config.DATABASE_PATH))
+        database = database_future.result()
         print(f"✓ Database connected")
     except Exception as e:
         errors.append(f"❌ Database error: {e}")
@@ -55,6 +61,9 @@ def validate_configuration():
     if not mks_file.exists():
         errors.append(f"❌ MKs file not found: {mks_file}")
     else:
+        # Imported here so runs that stop earlier skip loading rapidfuzz and rich
+        from knessight.modules.disambiguation import Disambiguation
+
         disambiguation = Disambiguation(database)
         mk_names = disambiguation.load_mk_list_from_file(mks_file)
         print(f"✓ Loaded {len(mk_names)} MK names")
@@ -69,28 +78,27 @@ def validate_configuration():
                 f"⚠ {len(mk_names) - len(resolved)} MKs could not be resolved"
             )
 
-        # Check speech counts
-        print("\nSpeech counts:")
-        for name, person_id in resolved.items():
-            speeches = database.get_all_speeches_by_person_id(person_id)
-            print(f"  {name} (ID {person_id}): {len(speeches)} speeches")
+        # Check speech counts (one grouped query for all MKs, one print)
+        counts = database.count_speeches_by_person_ids(list(resolved.values()))
+        report = "\n".join(
+            f"  {name} (ID {person_id}): {counts[person_id]} speeches"
+            for name, person_id in resolved.items()
+        )
+        print(f"\nSpeech counts:\n{report}")
 
     # Check topics
     topics_file = input_dir / "topics.txt"
     if not topics_file.exists():
         errors.append(f"❌ Topics file not found: {topics_file}")
     else:
-        with open(topics_file, "r", encoding="utf-8") as f:
-            topics = [
-                line.strip()
-                for line in f
-                if line.strip() and not line.strip().startswith("#")
-            ]
+        text = topics_file.read_text(encoding="utf-8")
+        lines = (line.strip() for line in text.splitlines())
+        topics = [line for line in lines if line and not line.startswith("#")]
         print(f"\n✓ Loaded {len(topics)} topics: {', '.join(topics)}")
 
         # Check topic descriptions
         try:
-            descriptions = config.load_topic_descriptions()
+            descriptions = descriptions_future.result()
             for topic in topics:
                 if topic not in descriptions:
                     errors.append(
@@ -102,10 +110,18 @@ def validate_configuration():
             errors.append(f"❌ Error loading topic descriptions: {e}")
 
         # Check scoring prompts
+        # One directory listing instead of a stat per topic
         scoring_prompts_dir = config.config_dir / "scoring_prompts"
+        existing = set()
+        if scoring_prompts_dir.is_dir():
+            existing = {
+                entry.name
+                for entry in os.scandir(scoring_prompts_dir)
+                if entry.is_file()
+            }
         for topic in topics:
             prompt_file = scoring_prompts_dir / f"{topic}.txt"
-            if not prompt_file.exists():
+            if prompt_file.name not in existing:
                 errors.append(f"❌ Missing scoring prompt: {prompt_file}")
             else:
                 print(f"  ✓ Scoring prompt for {topic} exists")